@@ -1,18 +1,28 @@
 # -*- coding: utf-8 -*-
 """
-Génère un mp3 par mot (pt-BR) + manifestes, à partir de:
+Génère un audio (mp3 avec gTTS) par mot (pt-BR) + manifestes, à partir de:
   - plan/vocab.json    : [{"pt","fr","phon"?,"id"?}, ...]
   - plan/lessons.json  : [{"id","title","words":[id|pt]}, ...]
 
 Nouveautés:
   - support du champ "phon" (phonétique, affichée dans l'interface)
   - inchangé: ne régénère pas un mp3 s'il existe (sauf --force)
+  - synthèse en parallèle (--jobs), avec nouvel essai (--retries) et limite de débit (--rate)
+  - cache audio adressé par contenu : audio/<2 car.>/<hash(moteur, texte, langue, lent)>.<ext>
+    (insérer un mot dans vocab.json ne décale plus les noms des fichiers suivants)
+  - un seul audio par texte prononcé (NFC, espaces réduits) : les entrées en double le partagent
+  - moteurs TTS interchangeables (--tts) : gtts (réseau), espeak / piper (hors ligne), stub (CI)
+  - post-traitement optionnel (--post mp3|opus, ffmpeg) : silences retirés, volume normalisé, débit voix ;
+    les clips traités sont mis en cache (audio/.post_cache.json) et jamais retraités s'ils n'ont pas changé
+  - manifeste global au choix (--manifest) : document JSON (v2) ou JSON Lines (v3, un mot par ligne)
+  - catalogue SQLite optionnel (--catalog) : mots, leçons et audios indexés, mis à jour ligne par ligne
 """
 
-import argparse, hashlib, json, re
+import argparse, hashlib, io, json, math, random, re, shutil, sqlite3, struct, subprocess, tempfile, threading, time, wave
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Tuple
-from gtts import gTTS
+from typing import Callable, Dict, List, Optional, Tuple
 
 def slugify(text: str) -> str:
     import unicodedata
@@ -27,10 +37,172 @@ def stable_key(text: str) -> str:
     h = hashlib.sha1(text.encode("utf-8")).hexdigest()[:8]
     return f"{s}-{h}"
 
-def say_pt(text_pt: str, outpath: Path, slow: bool = False):
+TTS_LANG = "pt-br"
+
+def spoken_text(text: str) -> str:
+    """Texte réellement prononcé : NFC, espaces réduits (deux saisies identiques à l'oreille => un seul audio)."""
+    import unicodedata
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+def audio_cache_path(text: str, slow: bool = False, lang: str = TTS_LANG,
+                     engine: str = "gtts", ext: str = "mp3") -> str:
+    """Chemin (relatif au dossier de sortie) d'un audio, ne dépendant que de ce qui est prononcé et par qui."""
+    key = f"{engine}\n{lang}\n{int(slow)}\n{text}"
+    h = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+    return f"audio/{h[:2]}/{h}.{ext}"
+
+def legacy_audio_files(audio_dir: Path) -> Dict[Tuple[str, bool], Path]:
+    """Anciens fichiers positionnels `0001-<id>.mp3` / `0001-<id>-slow.mp3`, indexés par (id, lent)."""
+    found: Dict[Tuple[str, bool], Path] = {}
+    if not audio_dir.is_dir():
+        return found
+    for f in audio_dir.glob("*.mp3"):
+        m = re.fullmatch(r"\d{4}-(.+?)(-slow)?\.mp3", f.name)
+        if m:
+            found.setdefault((m.group(1), bool(m.group(2))), f)
+    return found
+
+def write_bytes_atomic(outpath: Path, data: bytes):
+    # Écriture via un fichier temporaire : un audio interrompu n'est jamais pris pour "déjà présent"
     outpath.parent.mkdir(parents=True, exist_ok=True)
-    tts = gTTS(text=text_pt, lang="pt-br", slow=slow)
-    tts.save(str(outpath))
+    tmp = outpath.with_name(outpath.name + ".part")
+    tmp.write_bytes(data)
+    tmp.replace(outpath)
+
+# -----------------------------
+# Moteurs TTS
+# -----------------------------
+class TTSBackend(ABC):
+    """
+    Interface d'un moteur TTS : synthesize(textes, lent) -> un audio (bytes) par texte, dans le même ordre.
+    Classe abstraite : un moteur sans synthesize() échoue dès sa création, pas en cours de synthèse.
+    - name  : identifiant du moteur (+ voix), inclus dans la clé du cache audio
+    - ext   : extension des fichiers produits
+    - batch : True si le moteur traite efficacement toute la liste en un seul appel
+    """
+    name = "base"
+    ext = "mp3"
+    batch = False
+
+    @abstractmethod
+    def synthesize(self, texts: List[str], slow: bool = False) -> List[bytes]:
+        ...
+
+class GTTSBackend(TTSBackend):
+    """Google Translate TTS (réseau). Un appel HTTP par texte."""
+    name = "gtts"
+
+    def __init__(self, lang: str = TTS_LANG):
+        from gtts import gTTS   # dépendance optionnelle : seulement pour ce moteur
+        self._gTTS = gTTS
+        self.lang = lang
+
+    def synthesize(self, texts: List[str], slow: bool = False) -> List[bytes]:
+        out = []
+        for text in texts:
+            buf = io.BytesIO()
+            self._gTTS(text=text, lang=self.lang, slow=slow).write_to_fp(buf)
+            out.append(buf.getvalue())
+        return out
+
+class EspeakBackend(TTSBackend):
+    """espeak-ng en local (hors ligne). Un processus par texte, WAV sur stdout."""
+    ext = "wav"
+
+    def __init__(self, voice: str = "pt-br", exe: str = "espeak-ng"):
+        self.voice, self.exe = voice, exe
+        self.name = f"espeak-ng:{voice}"
+
+    def synthesize(self, texts: List[str], slow: bool = False) -> List[bytes]:
+        speed = "110" if slow else "160"   # mots par minute
+        return [subprocess.run([self.exe, "-v", self.voice, "-s", speed, "--stdout", text],
+                               capture_output=True, check=True).stdout
+                for text in texts]
+
+class PiperBackend(TTSBackend):
+    """Piper en local (hors ligne). Toute la liste passe dans un seul processus (un JSON par ligne sur stdin)."""
+    ext = "wav"
+    batch = True
+
+    def __init__(self, model: str, exe: str = "piper"):
+        self.model, self.exe = model, exe
+        self.name = f"piper:{Path(model).stem}"
+
+    def synthesize(self, texts: List[str], slow: bool = False) -> List[bytes]:
+        with tempfile.TemporaryDirectory() as tmp:
+            outs = [Path(tmp) / f"{i}.wav" for i in range(len(texts))]
+            lines = "\n".join(json.dumps({"text": " ".join(t.split()), "output_file": str(o)}, ensure_ascii=False)
+                              for t, o in zip(texts, outs))
+            subprocess.run([self.exe, "--model", self.model, "--json-input",
+                            "--length_scale", "1.5" if slow else "1.0"],
+                           input=lines.encode("utf-8"), capture_output=True, check=True)
+            return [o.read_bytes() for o in outs]
+
+class StubBackend(TTSBackend):
+    """Moteur factice déterministe (CI / essais hors ligne) : une sinusoïde dont la hauteur dépend du texte."""
+    name = "stub"
+    ext = "wav"
+    batch = True
+    RATE = 8000
+
+    def synthesize(self, texts: List[str], slow: bool = False) -> List[bytes]:
+        out = []
+        for text in texts:
+            freq = 220 + int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:4], 16) % 440
+            n = int(self.RATE * (0.3 + 0.05 * len(text)) * (1.5 if slow else 1.0))
+            frames = b"".join(struct.pack("<h", int(8000 * math.sin(2 * math.pi * freq * i / self.RATE)))
+                              for i in range(n))
+            buf = io.BytesIO()
+            with wave.open(buf, "wb") as w:
+                w.setnchannels(1); w.setsampwidth(2); w.setframerate(self.RATE)
+                w.writeframes(frames)
+            out.append(buf.getvalue())
+        return out
+
+def make_backend(name: str, piper_model: str = "", voice: str = "pt-br") -> TTSBackend:
+    if name == "gtts":
+        return GTTSBackend()
+    if name == "espeak":
+        return EspeakBackend(voice=voice)
+    if name == "piper":
+        if not piper_model:
+            raise SystemExit("❌ --tts piper nécessite --piper-model <modèle .onnx>")
+        return PiperBackend(piper_model)
+    if name == "stub":
+        return StubBackend()
+    raise SystemExit(f"❌ moteur TTS inconnu : {name}")
+
+class RateLimiter:
+    """Espace les appels TTS (partagé entre les threads). rate <= 0 : pas de limite."""
+    def __init__(self, rate: float = 0.0):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def call_with_retry(fn: Callable[[], None], retries: int = 3, backoff: float = 1.0,
+                    limiter: Optional[RateLimiter] = None, label: str = ""):
+    """Appelle fn() ; en cas d'erreur, réessaie avec un délai exponentiel (+ un peu d'aléa)."""
+    for attempt in range(retries + 1):
+        if limiter:
+            limiter.wait()
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= retries:
+                raise
+            delay = backoff * (2 ** attempt) * (1 + random.random() / 4)
+            print(f"↻  {label} : échec ({e}), nouvel essai dans {delay:.1f}s")
+            time.sleep(delay)
 
 def load_vocab(vocab_path: Path) -> List[Dict]:
     data = json.loads(vocab_path.read_text(encoding="utf-8"))
@@ -63,32 +235,248 @@ def build_vocab_index(vocab_rows: List[Dict]) -> Tuple[Dict[str, Dict], Dict[str
         pt_to_id.setdefault(r["pt"], r["id"])
     return by_id, pt_to_id
 
-def generate_audios(by_id: Dict[str, Dict], out_dir: Path, slow=False, force=False) -> Dict[str, Dict]:
+def generate_audios(by_id: Dict[str, Dict], out_dir: Path, slow=False, force=False,
+                    jobs: int = 4, retries: int = 3, rate: float = 0.0,
+                    backend: Optional[TTSBackend] = None, processed: Optional[set] = None) -> Dict[str, Dict]:
+    """
+    Synthétise les audios manquants avec `backend` (gTTS par défaut).
+    Chaque fichier est rangé sous audio_cache_path(...) : il reste valide tant que le texte ne change pas.
+    Moteur "batch" : un appel par vitesse avec toute la liste en attente ; sinon un pool de `jobs` threads.
+    Le manifeste retourné suit l'ordre de by_id : il est identique à celui d'une exécution séquentielle.
+    `processed` : clips bruts absents mais déjà post-traités (voir postprocess_audios), à ne pas resynthétiser.
+    """
+    backend = backend or GTTSBackend()
     audio_dir = out_dir / "audio"
     audio_dir.mkdir(parents=True, exist_ok=True)
+    legacy = legacy_audio_files(audio_dir) if backend.name == "gtts" else {}
     result: Dict[str, Dict] = {}
-    for i, (wid, item) in enumerate(by_id.items(), start=1):
+    todo: List[Tuple[str, str, Path, bool]] = []   # (icône, texte, fichier, lent)
+    refs: Dict[str, int] = {}                      # audio -> nombre d'entrées du manifeste qui l'utilisent
+    for wid, item in by_id.items():
         pt, fr, phon = item["pt"], item["fr"], item.get("phon","")
-        base = f"{i:04d}-{wid}"
-        file_normal = audio_dir / f"{base}.mp3"
-        file_slow   = audio_dir / f"{base}-slow.mp3"
-
-        if force or not file_normal.exists():
-            print(f"🔊 {pt} -> {file_normal.name}")
-            say_pt(pt, file_normal, slow=False)
-        else:
-            print(f"⏭️  {file_normal.name} déjà présent")
-        files = {"normal": f"audio/{file_normal.name}"}
-
-        if slow:
-            if force or not file_slow.exists():
-                print(f"🐢 {pt} -> {file_slow.name}")
-                say_pt(pt, file_slow, slow=True)
-            files["slow"] = f"audio/{file_slow.name}"
+        spoken = spoken_text(pt)
+        variants = [("🔊", False)] + ([("🐢", True)] if slow else [])
+        files = {}
+        for icon, is_slow in variants:
+            rel = audio_cache_path(spoken, is_slow, engine=backend.name, ext=backend.ext)
+            target = out_dir / rel
+            old = legacy.get((wid, is_slow))
+            refs[rel] = refs.get(rel, 0) + 1
+            if refs[rel] > 1:
+                pass   # même texte prononcé qu'une entrée précédente : audio partagé, déjà traité
+            elif not force and not target.exists() and rel in (processed or ()):
+                print(f"⏭️  {rel} déjà post-traité")
+            elif not force and not target.exists() and old and wid == stable_key(pt):
+                # Reprise d'un ancien fichier positionnel (id dérivé du texte => même prononciation) :
+                # déplacé, pas copié, pour ne pas garder deux exemplaires du même audio
+                target.parent.mkdir(parents=True, exist_ok=True)
+                old.replace(target)
+                print(f"♻️  {old.name} -> {rel}")
+            elif force or not target.exists():
+                todo.append((icon, spoken, target, is_slow))
+            else:
+                print(f"⏭️  {rel} déjà présent")
+            files["slow" if is_slow else "normal"] = rel
 
         result[wid] = {"id": wid, "pt": pt, "fr": fr, "phon": phon, "files": files}
+
+    if not todo:
+        report_shared_audio(refs, out_dir)
+        return result
+
+    # Lots de travail : (textes, fichiers, lent, libellé)
+    if backend.batch:
+        batches = []
+        for is_slow in (False, True):
+            group = [(text, path) for _, text, path, s in todo if s == is_slow]
+            if group:
+                batches.append(([t for t, _ in group], [p for _, p in group], is_slow,
+                                f"lot {backend.name} ({len(group)} textes)"))
+    else:
+        batches = [([text], [path], is_slow, path.name) for _, text, path, is_slow in todo]
+
+    def run(texts: List[str], paths: List[Path], is_slow: bool):
+        audios = backend.synthesize(texts, slow=is_slow)
+        if len(audios) != len(paths):
+            raise RuntimeError(f"{len(audios)} audios reçus pour {len(paths)} textes")
+        for path, data in zip(paths, audios):
+            write_bytes_atomic(path, data)
+
+    icons = {path: (icon, text) for icon, text, path, _ in todo}
+    limiter = RateLimiter(rate)
+    failures: List[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {
+            pool.submit(call_with_retry, lambda t=texts, p=paths, s=is_slow: run(t, p, s),
+                        retries, 1.0, limiter, label): (paths, label)
+            for texts, paths, is_slow, label in batches
+        }
+        for fut in as_completed(futures):
+            paths, label = futures[fut]
+            try:
+                fut.result()
+                for path in paths:
+                    icon, text = icons[path]
+                    print(f"{icon} {text} -> {path.name}")
+            except Exception as e:
+                failures.append(f"{label} ({e})")
+    if failures:
+        raise SystemExit("❌ Synthèse impossible pour : " + ", ".join(failures))
+    report_shared_audio(refs, out_dir)
     return result
 
+def report_legacy_audio(out_dir: Path):
+    """Anciens fichiers positionnels non repris (id non dérivé du texte, audio partagé...) : plus référencés."""
+    left = sorted(legacy_audio_files(out_dir / "audio").values())
+    if not left:
+        return
+    size = sum(f.stat().st_size for f in left)
+    print(f"🧹 {len(left)} ancien(s) audio(s) positionnel(s) ({size / 1024:.0f} Ko) ne sont plus utilisés "
+          f"par le manifeste et peuvent être supprimés :")
+    for f in left[:10]:
+        print(f"   - {f}")
+    if len(left) > 10:
+        print(f"   ... et {len(left) - 10} autre(s) ({out_dir / 'audio'}/????-*.mp3)")
+
+def report_shared_audio(refs: Dict[str, int], out_dir: Path):
+    """Bilan du dédoublonnage : synthèses et octets évités grâce aux audios partagés."""
+    shared = {rel: n for rel, n in refs.items() if n > 1}
+    if not shared:
+        return
+    saved_calls = sum(n - 1 for n in shared.values())
+    saved_bytes = sum((n - 1) * (out_dir / rel).stat().st_size for rel, n in shared.items() if (out_dir / rel).exists())
+    print(f"🔁 Dédoublonnage : {len(shared)} audio(s) partagé(s) par plusieurs entrées ; "
+          f"{saved_calls} synthèse(s) et {saved_bytes / 1024:.0f} Ko évités")
+
+# -----------------------------
+# Post-traitement audio (ffmpeg, optionnel)
+# -----------------------------
+# Silences de début/fin retirés, volume normalisé (EBU R128), ré-encodage en profil "voix" compact.
+# Le fichier traité est nommé d'après (profil, contenu du fichier brut) : un clip inchangé n'est jamais retraité.
+POST_FILTERS = ("silenceremove=start_periods=1:start_threshold=-45dB:start_silence=0.05,"
+                "areverse,silenceremove=start_periods=1:start_threshold=-45dB:start_silence=0.05,areverse,"
+                "loudnorm=I=-16:TP=-1.5:LRA=11")
+POST_FORMATS = {
+    # format : (extension, arguments d'encodage) ; mp3 reste lisible partout et compatible avec les sprites
+    "mp3":  ("mp3", ["-ac", "1", "-ar", "24000", "-c:a", "libmp3lame", "-b:a", "{bitrate}"]),
+    "opus": ("ogg", ["-ac", "1", "-ar", "24000", "-c:a", "libopus", "-b:a", "{bitrate}", "-application", "voip"]),
+}
+POST_CACHE = "audio/.post_cache.json"   # clip brut -> { sha1 du brut, profil, fichier traité }
+
+class AudioPost:
+    def __init__(self, fmt: str = "mp3", bitrate: str = "32k", exe: str = "ffmpeg"):
+        if shutil.which(exe) is None:
+            raise SystemExit(f"❌ --post nécessite {exe} (introuvable dans le PATH)")
+        self.exe = exe
+        self.ext, args = POST_FORMATS[fmt]
+        self.args = [a.format(bitrate=bitrate) for a in args]
+        self.profile = "\n".join([POST_FILTERS, *self.args])   # toute modification du réglage invalide le cache
+
+    def out_rel(self, raw_sha1: str) -> str:
+        h = hashlib.sha1(f"{self.profile}\n{raw_sha1}".encode("utf-8")).hexdigest()[:20]
+        return f"audio/{h[:2]}/{h}.{self.ext}"
+
+    def process(self, src: Path, dst: Path):
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_name(dst.name + ".part." + self.ext)   # ffmpeg déduit le conteneur de l'extension
+        subprocess.run([self.exe, "-hide_banner", "-loglevel", "error", "-y", "-i", str(src),
+                        "-af", POST_FILTERS, *self.args, str(tmp)], capture_output=True, check=True)
+        tmp.replace(dst)
+
+def read_post_cache(out_dir: Path) -> Dict[str, Dict]:
+    try:
+        return json.loads((out_dir / POST_CACHE).read_text(encoding="utf-8")).get("clips", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+def processed_raws(out_dir: Path, post: "AudioPost") -> set:
+    """Clips bruts dont la version traitée (profil courant) existe : inutile de les resynthétiser."""
+    return {raw for raw, e in read_post_cache(out_dir).items()
+            if e.get("profile") == post.profile and (out_dir / e.get("out", "")).exists()}
+
+def postprocess_audios(words: Dict[str, Dict], out_dir: Path, post: AudioPost,
+                       jobs: int = 4, drop_raw: bool = False) -> Dict[str, Dict]:
+    """
+    Traite (en parallèle) chaque audio du manifeste et remplace son chemin par celui du fichier traité.
+    Cache : <out>/audio/.post_cache.json. drop_raw : supprime les bruts traités (le cache évite leur resynthèse).
+    """
+    cache = read_post_cache(out_dir)
+    todo: Dict[str, Tuple[Path, Path]] = {}   # brut -> (source, destination)
+    mapping: Dict[str, str] = {}
+    raw_bytes = out_bytes = 0
+    for item in words.values():
+        for raw in item["files"].values():
+            if raw in mapping or raw in todo:
+                continue
+            entry, src = cache.get(raw, {}), out_dir / raw
+            if not src.exists():
+                # Brut supprimé (drop_raw) : seule la version traitée connue est utilisable
+                if entry.get("profile") != post.profile or not (out_dir / entry.get("out", "")).exists():
+                    raise SystemExit(f"❌ {raw} introuvable (relancez avec --force pour le resynthétiser)")
+                mapping[raw] = entry["out"]
+                continue
+            data = src.read_bytes()
+            raw_bytes += len(data)
+            sha = hashlib.sha1(data).hexdigest()
+            out = post.out_rel(sha)
+            cache[raw] = {"sha1": sha, "profile": post.profile, "out": out}
+            if (out_dir / out).exists():
+                mapping[raw] = out
+            else:
+                todo[raw] = (src, out_dir / out)
+
+    failures: List[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {pool.submit(post.process, src, dst): raw for raw, (src, dst) in todo.items()}
+        for fut in as_completed(futures):
+            raw = futures[fut]
+            try:
+                fut.result()
+                mapping[raw] = cache[raw]["out"]
+                print(f"🎚️  {raw} -> {mapping[raw]}")
+            except Exception as e:
+                failures.append(f"{raw} ({e})")
+                cache.pop(raw, None)
+    write_bytes_atomic(out_dir / POST_CACHE,
+                       json.dumps({"version": 1, "clips": dict(sorted(cache.items()))}, indent=1).encode("utf-8"))
+    if failures:
+        raise SystemExit("❌ Post-traitement impossible pour : " + ", ".join(failures))
+
+    for raw, out in mapping.items():
+        out_bytes += (out_dir / out).stat().st_size
+        if drop_raw and (out_dir / raw).exists():
+            (out_dir / raw).unlink()
+    for item in words.values():
+        item["files"] = {k: mapping[v] for k, v in item["files"].items()}
+    print(f"🎚️  Post-traitement : {len(todo)} traité(s), {len(mapping) - len(todo)} déjà à jour ; "
+          f"bruts lus {raw_bytes / 1e6:.1f} Mo -> traités {out_bytes / 1e6:.1f} Mo")
+    return words
+
+def write_global_manifest(words, out_dir: Path, fmt: str = "json") -> Path:
+    """
+    Manifeste global, au format lu par 01_main.py :
+    - json  : manifest_global.json, {"version": 2, "count", "words": [...]}
+    - jsonl : manifest_global.jsonl, en-tête {"version": 3, "count"} puis un mot par ligne (lu en flux)
+    Le fichier de l'autre format est supprimé : le générateur préfère le .jsonl s'il existe.
+    """
+    words = list(words)
+    paths = {"json": out_dir / "manifest_global.json", "jsonl": out_dir / "manifest_global.jsonl"}
+    path = paths[fmt]
+    tmp = path.with_name(path.name + ".part")
+    if fmt == "jsonl":
+        with tmp.open("w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": 3, "count": len(words)}) + "\n")
+            for w in words:
+                f.write(json.dumps(w, ensure_ascii=False, separators=(",", ":")) + "\n")
+    else:
+        doc = {"version": 2, "count": len(words), "words": words}
+        tmp.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp.replace(path)
+    for other, p in paths.items():
+        if other != fmt and p.exists():
+            p.unlink()
+    return path
+
 def build_lesson_manifests(lessons, by_id, out_dir: Path, pt_to_id, fail_on_missing=False):
     lessons_dir = out_dir / "lessons"
     lessons_dir.mkdir(parents=True, exist_ok=True)
@@ -110,6 +498,111 @@ def build_lesson_manifests(lessons, by_id, out_dir: Path, pt_to_id, fail_on_miss
     (lessons_dir / "_index.json").write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
     return index
 
+# -----------------------------
+# Catalogue SQLite (optionnel, --catalog)
+# -----------------------------
+# Mêmes données que les manifestes, indexées : lu par 01_main.py (23_utils_catalog.py) à la place des JSON.
+# Chaque exécution ajoute une ligne à `builds` ; les lignes modifiées portent son numéro (changed_in),
+# les supprimées sont gardées avec removed_in : "qu'est-ce qui a changé depuis le build X" est une requête indexée.
+# builds.sources_sha1 : empreinte du contenu des manifestes JSON écrits par la même exécution ; le lecteur
+# ignore le catalogue si elle ne correspond plus (JSON régénérés sans --catalog, catalogue ancien versionné...).
+CATALOG_NAME = "catalog.sqlite"
+CATALOG_VERSION = 2   # PRAGMA user_version, vérifié par le lecteur (2 : builds.sources_sha1)
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (id INTEGER PRIMARY KEY, at TEXT NOT NULL, words_sha1 TEXT NOT NULL,
+    words_changed INTEGER NOT NULL DEFAULT 0, lessons_changed INTEGER NOT NULL DEFAULT 0, sources_sha1 TEXT);
+CREATE TABLE IF NOT EXISTS words (id TEXT PRIMARY KEY, position INTEGER NOT NULL, pt TEXT, fr TEXT, phon TEXT,
+    data TEXT NOT NULL, changed_in INTEGER NOT NULL, removed_in INTEGER);
+CREATE INDEX IF NOT EXISTS words_position ON words(position);
+CREATE INDEX IF NOT EXISTS words_pt ON words(pt);
+CREATE INDEX IF NOT EXISTS words_changed ON words(changed_in);
+CREATE TABLE IF NOT EXISTS lessons (id TEXT PRIMARY KEY, position INTEGER NOT NULL, title TEXT,
+    data TEXT NOT NULL, changed_in INTEGER NOT NULL, removed_in INTEGER);
+CREATE INDEX IF NOT EXISTS lessons_changed ON lessons(changed_in);
+CREATE TABLE IF NOT EXISTS lesson_words (lesson_id TEXT NOT NULL, position INTEGER NOT NULL, word_id TEXT NOT NULL,
+    PRIMARY KEY (lesson_id, position));
+CREATE INDEX IF NOT EXISTS lesson_words_word ON lesson_words(word_id);
+CREATE TABLE IF NOT EXISTS audio_files (word_id TEXT NOT NULL, kind TEXT NOT NULL, path TEXT NOT NULL,
+    bytes INTEGER, changed_in INTEGER NOT NULL, PRIMARY KEY (word_id, kind));
+CREATE INDEX IF NOT EXISTS audio_files_path ON audio_files(path);
+"""
+
+def manifests_sha1(out_dir: Path) -> str:
+    """Empreinte des manifestes JSON (même calcul que manifests_sha1 dans 23_utils_catalog.py)."""
+    h = hashlib.sha1()
+    for rel in ("manifest_global.jsonl", "manifest_global.json", "lessons/_index.json"):
+        p = out_dir / rel
+        if p.exists():
+            h.update(rel.encode("utf-8") + b"\0" + p.read_bytes() + b"\0")
+    return h.hexdigest()
+
+def write_catalog(words, lessons_index: dict, out_dir: Path) -> Tuple[int, int, int]:
+    """
+    Met à jour <out>/catalog.sqlite : seules les lignes dont le contenu a changé sont réécrites.
+    À appeler après l'écriture des manifestes JSON (leur empreinte est enregistrée dans `builds`).
+    Retourne (numéro du build, mots modifiés, leçons modifiées).
+    """
+    words = list(words)
+    db = sqlite3.connect(out_dir / CATALOG_NAME)
+    try:
+        db.executescript(CATALOG_SCHEMA)
+        if "sources_sha1" not in {row[1] for row in db.execute("PRAGMA table_info(builds)")}:   # catalogue v1
+            db.execute("ALTER TABLE builds ADD COLUMN sources_sha1 TEXT")
+        db.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+        digest = hashlib.sha1(json.dumps(words, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+        with db:
+            build = db.execute("INSERT INTO builds (at, words_sha1, sources_sha1) VALUES (?, ?, ?)",
+                               (time.strftime("%Y-%m-%dT%H:%M:%S"), digest, manifests_sha1(out_dir))).lastrowid
+
+            old = dict(db.execute("SELECT id, data FROM words WHERE removed_in IS NULL"))
+            words_changed = 0
+            for pos, w in enumerate(words):
+                wid, data = w["id"], json.dumps(w, ensure_ascii=False)
+                if old.pop(wid, None) == data:
+                    db.execute("UPDATE words SET position = ? WHERE id = ? AND position != ?", (pos, wid, pos))
+                    continue
+                words_changed += 1
+                db.execute("""INSERT INTO words (id, position, pt, fr, phon, data, changed_in, removed_in)
+                              VALUES (?, ?, ?, ?, ?, ?, ?, NULL)
+                              ON CONFLICT(id) DO UPDATE SET position = excluded.position, pt = excluded.pt,
+                                fr = excluded.fr, phon = excluded.phon, data = excluded.data,
+                                changed_in = excluded.changed_in, removed_in = NULL""",
+                           (wid, pos, w.get("pt"), w.get("fr"), w.get("phon"), data, build))
+                db.execute("DELETE FROM audio_files WHERE word_id = ?", (wid,))
+                for kind, rel in (w.get("files") or {}).items():
+                    path = out_dir / rel
+                    db.execute("INSERT INTO audio_files (word_id, kind, path, bytes, changed_in) VALUES (?, ?, ?, ?, ?)",
+                               (wid, kind, rel, path.stat().st_size if path.exists() else None, build))
+            db.executemany("UPDATE words SET removed_in = ?, changed_in = ? WHERE id = ?", [(build, build, wid) for wid in old])
+            db.executemany("DELETE FROM audio_files WHERE word_id = ?", [(wid,) for wid in old])
+            words_changed += len(old)
+
+            old = dict(db.execute("SELECT id, data FROM lessons WHERE removed_in IS NULL"))
+            lessons_changed = 0
+            for pos, (lid, lesson) in enumerate(lessons_index.items()):
+                data = json.dumps(lesson, ensure_ascii=False)
+                if old.pop(lid, None) == data:
+                    db.execute("UPDATE lessons SET position = ? WHERE id = ? AND position != ?", (pos, lid, pos))
+                    continue
+                lessons_changed += 1
+                db.execute("""INSERT INTO lessons (id, position, title, data, changed_in, removed_in)
+                              VALUES (?, ?, ?, ?, ?, NULL)
+                              ON CONFLICT(id) DO UPDATE SET position = excluded.position, title = excluded.title,
+                                data = excluded.data, changed_in = excluded.changed_in, removed_in = NULL""",
+                           (lid, pos, lesson.get("title"), data, build))
+                db.execute("DELETE FROM lesson_words WHERE lesson_id = ?", (lid,))
+                db.executemany("INSERT INTO lesson_words (lesson_id, position, word_id) VALUES (?, ?, ?)",
+                               [(lid, i, ref["id"]) for i, ref in enumerate(lesson.get("words") or [])])
+            db.executemany("UPDATE lessons SET removed_in = ?, changed_in = ? WHERE id = ?", [(build, build, lid) for lid in old])
+            db.executemany("DELETE FROM lesson_words WHERE lesson_id = ?", [(lid,) for lid in old])
+            lessons_changed += len(old)
+
+            db.execute("UPDATE builds SET words_changed = ?, lessons_changed = ? WHERE id = ?",
+                       (words_changed, lessons_changed, build))
+    finally:
+        db.close()
+    return build, words_changed, lessons_changed
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--vocab", type=str, default="plan/vocab.json")
@@ -118,22 +611,46 @@ def main():
     ap.add_argument("--slow", action="store_true")
     ap.add_argument("--force", action="store_true")
     ap.add_argument("--fail-on-missing", action="store_true")
+    ap.add_argument("--jobs", type=int, default=4, help="synthèses TTS en parallèle")
+    ap.add_argument("--retries", type=int, default=3, help="nouveaux essais par fichier en cas d'erreur")
+    ap.add_argument("--rate", type=float, default=4.0, help="appels TTS max par seconde (0 = illimité)")
+    ap.add_argument("--tts", choices=["gtts", "espeak", "piper", "stub"], default="gtts",
+                    help="moteur TTS (espeak/piper : hors ligne, stub : sinusoïde factice pour la CI)")
+    ap.add_argument("--voice", type=str, default="pt-br", help="voix espeak-ng")
+    ap.add_argument("--piper-model", type=str, default="", help="modèle .onnx pour --tts piper")
+    ap.add_argument("--post", choices=["off", *POST_FORMATS], default="off",
+                    help="post-traitement ffmpeg : silences retirés, volume normalisé, ré-encodage voix")
+    ap.add_argument("--post-bitrate", type=str, default="32k", help="débit du ré-encodage (--post)")
+    ap.add_argument("--drop-raw", action="store_true", help="supprime les audios bruts une fois traités (--post)")
+    ap.add_argument("--manifest", choices=["json", "jsonl"], default="json",
+                    help="format du manifeste global (jsonl : un mot par ligne, pour les très gros vocabulaires)")
+    ap.add_argument("--catalog", action="store_true",
+                    help="met aussi à jour catalog.sqlite (mots, leçons, audios indexés ; lu en priorité par 01_main.py)")
     args = ap.parse_args()
 
     vocab_rows = load_vocab(Path(args.vocab))
     by_id, pt_to_id = build_vocab_index(vocab_rows)
 
     out_dir = Path(args.out)
-    words_manifest = generate_audios(by_id, out_dir, slow=args.slow, force=args.force)
+    post = AudioPost(args.post, args.post_bitrate) if args.post != "off" else None
+    words_manifest = generate_audios(by_id, out_dir, slow=args.slow, force=args.force,
+                                     jobs=args.jobs, retries=args.retries, rate=args.rate,
+                                     backend=make_backend(args.tts, args.piper_model, args.voice),
+                                     processed=processed_raws(out_dir, post) if post and not args.force else None)
+    if post:
+        words_manifest = postprocess_audios(words_manifest, out_dir, post, jobs=args.jobs, drop_raw=args.drop_raw)
 
-    global_manifest = {"version": 2, "count": len(words_manifest), "words": list(words_manifest.values())}
-    (out_dir / "manifest_global.json").write_text(json.dumps(global_manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    manifest_path = write_global_manifest(words_manifest.values(), out_dir, args.manifest)
+    report_legacy_audio(out_dir)
 
     lessons = load_lessons(Path(args.lessons))
-    build_lesson_manifests(lessons, by_id, out_dir, pt_to_id, fail_on_missing=args.fail_on_missing)
+    lessons_index = build_lesson_manifests(lessons, by_id, out_dir, pt_to_id, fail_on_missing=args.fail_on_missing)
+    if args.catalog:
+        build, n_words, n_lessons = write_catalog(words_manifest.values(), lessons_index, out_dir)
+        print(f"🗃️  Catalogue : build {build}, {n_words} mot(s) et {n_lessons} leçon(s) modifié(s)")
 
     print("\n✅ Terminé")
-    print(f"📄 {out_dir / 'manifest_global.json'}")
+    print(f"📄 {manifest_path}")
     print(f"📁 {out_dir / 'lessons'}")
 
 if __name__ == "__main__":
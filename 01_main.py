@@ -1,8 +1,19 @@
 # -*- coding: utf-8 -*-
 """
-Main entrypoint (numéroté) sans arguments en ligne de commande.
-Tous les paramètres sont définis directement ci-dessous.
-- Génère : index, pages leçons, quiz (QCM) global & par leçon, dictée globale & par leçon.
+Main entrypoint (numéroté).
+Tous les paramètres sont définis directement ci-dessous ; seul le parallélisme
+peut être surchargé en ligne de commande (--jobs N).
+- Génère : index, pages leçons, quiz (QCM) global & par leçon, dictée globale & par leçon,
+  statistiques (stats.html, résultats des parties enregistrés dans IndexedDB).
+- Build incrémental : seules les pages dont les entrées ont changé sont régénérées
+  (empreintes dans <OUT_DIR>/.build_cache.json).
+- CSS/JS communs écrits une fois (base.<hash>.css, common/quiz/dictation.<hash>.js) et
+  référencés par les pages ; ASSETS_INLINE = True les recopie dans chaque page (fichier unique).
+- Quiz / dictée par leçon : audios regroupés en un sprite MP3 (sprites/<id>.<hash>.mp3), voir AUDIO_SPRITES.
+- Manifeste : catalog.sqlite (script 1 --catalog) s'il est à jour, sinon manifest_global.jsonl (v3, lu en flux),
+  sinon manifest_global.json (v2).
+- Service worker (SERVICE_WORKER) : sur le site hébergé, pages, assets et audios servis depuis le cache.
+- Recherche "Tous les mots" : index de trigrammes (sans accents) précalculé dans pools/_search.<hash>.js.
 """
 from pathlib import Path
 import sys
@@ -24,18 +35,33 @@ mod_names = [
     ("assets_base_css", "02_assets_base_css.py"),
     ("assets_base_js_common", "03_assets_base_js_common.py"),
     ("assets_quiz_js", "04_assets_quiz_js.py"),
+    ("assets_word_list_js", "19_assets_word_list_js.py"),   # requis par utils_write_html
+    ("assets_srs_js", "27_assets_srs_js.py"),
+    ("assets_results_js", "28_assets_results_js.py"),
     ("utils_load_json", "05_utils_load_json.py"),
     ("utils_write_html", "06_utils_write_html.py"),
+    ("utils_search_index", "20_utils_search_index.py"),       # requis par utils_build_word_card et pages_build_index
     ("utils_build_word_card", "07_utils_build_word_card.py"),
+    ("pages_to_quiz_pool_js", "10_pages_to_quiz_pool_js.py"),      # requis par pages_build_index
+    ("utils_audio_sprites", "22_utils_audio_sprites.py"),     # requis par les pages quiz / dictée
     ("pages_build_index", "08_pages_build_index.py"),
     ("pages_build_lesson_pages", "09_pages_build_lesson_pages.py"),
-    ("pages_to_quiz_pool_js", "10_pages_to_quiz_pool_js.py"),
     ("pages_build_quiz_page", "11_pages_build_quiz_page.py"),
     ("pages_build_quiz_pages", "12_pages_build_quiz_pages.py"),
     # --- Nouveaux modules : Dictée ---
     ("assets_dictation_js", "13_assets_dictation_js.py"),
     ("pages_build_dictation_page", "14_pages_build_dictation_page.py"),
     ("pages_build_dictation_pages", "15_pages_build_dictation_pages.py"),
+    # --- Build incrémental ---
+    ("utils_build_cache", "16_utils_build_cache.py"),
+    ("utils_build_context", "17_utils_build_context.py"),
+    ("utils_minify", "25_utils_minify.py"),                   # requis par assets_pipeline
+    ("assets_pipeline", "18_assets_pipeline.py"),
+    ("pages_build_search_bench", "21_pages_build_search_bench.py"),
+    ("pages_build_stats_page", "29_pages_build_stats_page.py"),
+    ("utils_catalog", "23_utils_catalog.py"),
+    ("utils_precompress", "24_utils_precompress.py"),
+    ("pages_build_service_worker", "26_pages_build_service_worker.py"),
 ]
 mods = {alias: _load(alias, fname) for alias, fname in mod_names}
 
@@ -51,42 +77,170 @@ DELAY      = 900                   # Délai en ms avant d'enchaîner (QCM)
 # Dictée
 DICT_TIMER  = 12                   # Secondes par item (dictée)
 DICT_REVEAL = 1500                 # ms d’affichage du feedback avant “Suivant” (dictée)
+DICT_TYPOS  = 0.2                  # Fautes de frappe tolérées : distance ≤ 20 % de la longueur (arrondi bas) ; 0 = aucune
+DICT_TYPO_MIN_LETTERS = 5          # Réponses plus courtes : aucune faute de frappe tolérée (accents seulement)
+DICT_ACCENT_POINTS = 0.75          # Points d'une réponse juste aux accents près
+DICT_TYPO_POINTS   = 0.5           # Points d'une réponse à quelques fautes de frappe près
+
+# Build
+FORCE       = False                # True : ignore le cache et régénère toutes les pages
+JOBS        = 1                    # Processus pour les pages par leçon (surchargeable : --jobs N)
+LESSON_LRU  = 512                  # Leçons gardées en mémoire (chargées une fois pour leçon + quiz + dictée)
+ASSETS_INLINE = False              # True : CSS/JS recopiés dans chaque page (HTML autonome, ex: envoi d'un seul fichier)
+MINIFY        = False              # True : build de production, CSS/JS minifiés ; False : sources lisibles (dev)
+AUDIO_SPRITES = "lessons"          # Clips d'une leçon regroupés en un MP3 : "off", "lessons" ou "all" (+ global par paquets)
+SEARCH_BENCH  = False              # True : génère aussi bench-search.html (temps de recherche à 10k/100k mots)
+SERVICE_WORKER = True              # Site hébergé : sw.js + precache.<hash>.js (pages, assets et audios en cache)
+SW_AUDIO      = "lessons"          # Audios mis en cache : "off", "lessons" (à l'ouverture d'une leçon) ou "all"
+PRECOMPRESS   = False              # True : .gz (+ .br si brotli est installé) à côté de chaque HTML/JS/CSS produit
+USE_CATALOG   = True               # Lit catalog.sqlite (script 1 --catalog) à la place des manifestes JSON s'il est à jour
+
+# État partagé avec les processus fils (hérité par fork, ou transmis une fois par processus sinon)
+_SHARED: dict = {}
+
+def build_pages(shared: dict, lesson_ids, cache, include_global: bool = True):
+    """Génère les pages des leçons `lesson_ids` (+ accueil, quiz et dictée globaux si include_global)."""
+    out_dir, ctx = shared["out_dir"], shared["ctx"]
+
+    # Pages de contenu
+    if include_global:
+        mods["pages_build_index"].build_index(ctx, out_dir, TITLE, assets=shared["assets"], cache=cache)
+        build_lesson_set(shared, ctx.subset([]), cache, include_global=True)
+        mods["pages_build_stats_page"].build_stats_page(out_dir, shared["assets"], cache=cache)
+        if SEARCH_BENCH:
+            mods["pages_build_search_bench"].build_search_bench(out_dir, shared["assets"], cache=cache)
+
+    # Par paquets de la taille du cache LRU : chaque leçon n'est lue qu'une fois pour ses trois pages
+    lesson_ids = list(lesson_ids)
+    for i in range(0, len(lesson_ids), ctx.max_lessons):
+        build_lesson_set(shared, ctx.subset(lesson_ids[i:i + ctx.max_lessons]), cache, include_global=False)
+
+def build_lesson_set(shared: dict, ctx, cache, include_global: bool):
+    out_dir = shared["out_dir"]
+    mods["pages_build_lesson_pages"].build_lesson_pages(ctx, out_dir, assets=shared["assets"], cache=cache)
+
+    # Quiz QCM
+    mods["pages_build_quiz_pages"].build_quiz_pages(
+        ctx, out_dir, assets=shared["assets"], timer_seconds=TIMER,
+        cache=cache, include_global=include_global, sprites=AUDIO_SPRITES)
+
+    # Dictée
+    mods["pages_build_dictation_pages"].build_dictation_pages(
+        ctx, out_dir, assets=shared["assets"], timer_seconds=DICT_TIMER,
+        cache=cache, include_global=include_global, sprites=AUDIO_SPRITES)
+
+def _init_worker(shared=None):
+    if shared is not None:
+        _SHARED.update(shared)
+
+def _build_shard(lesson_ids):
+    """Processus fils : pages d'un lot de leçons ; retourne les décisions du cache pour fusion."""
+    cache = mods["utils_build_cache"].BuildCache(_SHARED["cache_path"], salt=_SHARED["salt"], force=FORCE)
+    before = mods["utils_write_html"].write_stats()   # compteurs hérités du parent (fork) ou d'un lot précédent
+    build_pages(_SHARED, lesson_ids, cache, include_global=False)
+    writes = {k: v - before[k] for k, v in mods["utils_write_html"].write_stats().items()}
+    return cache.new, cache.built, cache.skipped, cache.files, writes
+
+def build_pages_parallel(shared: dict, cache, jobs: int):
+    """Pages globales dans ce processus, puis leçons réparties (round-robin) sur `jobs` processus."""
+    import multiprocessing as mp
+    from concurrent.futures import ProcessPoolExecutor
+
+    build_pages(shared, [], cache, include_global=True)
+
+    lids = shared["ctx"].lesson_ids
+    n_shards = min(len(lids), jobs * 4)
+    shards = [lids[i::n_shards] for i in range(n_shards)]
+    if not shards:
+        return
+
+    # fork : le contexte (manifeste indexé) construit ici est partagé (copie à l'écriture), rien n'est sérialisé
+    use_fork = "fork" in mp.get_all_start_methods()
+    mp_ctx = mp.get_context("fork" if use_fork else None)
+    _SHARED.clear(); _SHARED.update(shared)
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=mp_ctx, initializer=_init_worker,
+                             initargs=(None if use_fork else shared,)) as pool:
+        for new, built, skipped, files, writes in pool.map(_build_shard, shards):
+            cache.merge(new, built, skipped, files)
+            mods["utils_write_html"].merge_write_stats(writes)
+
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description="Génère le site statique (paramètres : voir le haut du fichier).")
+    ap.add_argument("--jobs", type=int, default=JOBS, help="processus pour les pages par leçon (défaut : JOBS)")
+    args = ap.parse_args(argv)
 
-def main():
     root = ROOT_DIR
     out_dir = OUT_DIR
     out_dir.mkdir(parents=True, exist_ok=True)
 
     load_json            = mods["utils_load_json"].load_json
-    build_index          = mods["pages_build_index"].build_index
-    build_lesson_pages   = mods["pages_build_lesson_pages"].build_lesson_pages
-    build_quiz_pages     = mods["pages_build_quiz_pages"].build_quiz_pages
+    get_base_css         = mods["assets_base_css"].get_base_css
+    get_base_js_common   = mods["assets_base_js_common"].get_base_js_common
     make_quiz_js         = mods["assets_quiz_js"].make_quiz_js
     # Dictée
-    build_dictation_pages = mods["pages_build_dictation_pages"].build_dictation_pages
     make_dictation_js     = mods["assets_dictation_js"].make_dictation_js
+    BuildCache            = mods["utils_build_cache"].BuildCache
+    hash_inputs           = mods["utils_build_cache"].hash_inputs
+    BuildContext          = mods["utils_build_context"].BuildContext
+    AssetBundle           = mods["assets_pipeline"].AssetBundle
 
-    mg = root / "manifest_global.json"
-    li = root / "lessons" / "_index.json"
-    if not mg.exists():
-        raise SystemExit(f"[ERREUR] introuvable : {mg}")
-    if not li.exists():
-        raise SystemExit(f"[ERREUR] introuvable : {li}")
+    catalog = mods["utils_catalog"].open_catalog(root) if USE_CATALOG else None
+    if catalog is not None:
+        # Mots et leçons lus par requêtes indexées ; aucun JSON relu
+        global_manifest = catalog
+        lessons_index   = catalog.lessons_index()
+        print(f"🗃️  Catalogue : {catalog.path} (build {catalog.build})")
+    else:
+        li = root / "lessons" / "_index.json"
+        global_manifest = mods["utils_load_json"].open_manifest(root)   # .jsonl (v3, lu en flux) ou .json (v2)
+        if not li.exists():
+            raise SystemExit(f"[ERREUR] introuvable : {li}")
+        lessons_index   = load_json(li)
 
-    global_manifest = load_json(mg)
-    lessons_index   = load_json(li)
+    # Cache de build : toute modification du générateur (gabarits, CSS/JS de base) invalide tout
+    salt = hash_inputs(*[(HERE / fname).read_text(encoding="utf-8") for _, fname in mod_names])
+    cache_path = out_dir / ".build_cache.json"
+    cache = BuildCache(cache_path, salt=salt, force=FORCE)
 
-    # Pages de contenu
-    build_index(root, out_dir, TITLE, global_manifest, lessons_index)
-    build_lesson_pages(root, out_dir, lessons_index, global_manifest)
+    # Assets partagés (écrits une seule fois, avant les pages qui les référencent)
+    assets = AssetBundle(inline=ASSETS_INLINE, minify=MINIFY)
+    assets.add("base", "css", get_base_css())
+    sw = mods["pages_build_service_worker"]
+    assets.add("common", "js", get_base_js_common() + (sw.SW_REGISTER_JS if SERVICE_WORKER else ""))
+    assets.add("quiz", "js", make_quiz_js(timer_seconds=TIMER, auto_delay_ms=DELAY))
+    assets.add("dictation", "js", make_dictation_js(timer_seconds=DICT_TIMER, reveal_delay_ms=DICT_REVEAL, typo_tolerance=DICT_TYPOS,
+                                                    accent_points=DICT_ACCENT_POINTS, typo_points=DICT_TYPO_POINTS,
+                                                    typo_min_letters=DICT_TYPO_MIN_LETTERS))
+    assets.add("wordlist", "js", mods["assets_word_list_js"].get_word_list_js())
+    assets.add("srs", "js", mods["assets_srs_js"].get_srs_js())   # répétition espacée (quiz et dictée)
+    assets.add("results", "js", mods["assets_results_js"].get_results_js())   # parties enregistrées (stats.html)
+    assets.write(out_dir, cache=cache)
 
-    # Quiz QCM
-    quiz_js = make_quiz_js(timer_seconds=TIMER, auto_delay_ms=DELAY)
-    build_quiz_pages(root, out_dir, lessons_index, global_manifest, quiz_js=quiz_js, timer_seconds=TIMER)
+    shared = {
+        "out_dir": out_dir,
+        # Manifeste indexé une seule fois ; leçons lues à la demande (LRU) par tous les générateurs
+        "ctx": BuildContext(root, global_manifest, lessons_index, max_lessons=LESSON_LRU),
+        "assets": assets,
+        "salt": salt, "cache_path": cache_path,
+    }
+    if args.jobs > 1:
+        build_pages_parallel(shared, cache, args.jobs)
+    else:
+        build_pages(shared, list(lessons_index), cache)
 
-    # Dictée
-    dictation_js = make_dictation_js(timer_seconds=DICT_TIMER, reveal_delay_ms=DICT_REVEAL)
-    build_dictation_pages(root, out_dir, lessons_index, global_manifest, dictation_js=dictation_js, timer_seconds=DICT_TIMER)
+    # Après toutes les pages : le manifeste du service worker liste ce que ce build a produit
+    if SERVICE_WORKER:
+        sw_report = sw.build_service_worker(shared["ctx"], out_dir, assets, cache.new, audio=SW_AUDIO)
+    else:
+        sw_report = ""
+        sw.disable_service_worker(out_dir)
+    cache.save()
+    precompress_report = ""
+    if PRECOMPRESS:
+        # Fichiers écrits ou conservés par ce build : pages et assets (cache de build), pools et sprites, service worker
+        outputs = [*cache.new, *(f for files in cache.files.values() for f in files), *sw.service_worker_files(out_dir)]
+        precompress_report = mods["utils_precompress"].precompress(out_dir, outputs, force=FORCE)
 
     print("✅ Interface générée avec succès")
     print(f" - Accueil            : {out_dir / 'index.html'}")
@@ -94,8 +248,13 @@ def main():
     print(f" - Dictée globale     : {out_dir / 'dictation.html'}")
     print(f" - Quiz par leçon     : {out_dir}/quiz-<id>.html")
     print(f" - Dictée par leçon   : {out_dir}/dictation-<id>.html")
+    print(f" - Statistiques       : {out_dir / 'stats.html'}")
+    print(cache.report())
+    print(mods["utils_write_html"].write_report())
+    if sw_report:
+        print(sw_report)
+    if precompress_report:
+        print(precompress_report)
 
 if __name__ == "__main__":
     main()
-
-## https://github.com/patrickrueff/mon-quiz-ptbr.git
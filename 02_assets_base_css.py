@@ -36,5 +36,13 @@ button:hover,a.btn:hover{border-color:var(--accent)} button:active,a.btn:active{
 .kpi{display:flex;gap:12px;flex-wrap:wrap}
 .kpi .pill{padding:6px 10px;border:1px solid var(--border);border-radius:999px;background:#0e141d;color:#eef3fb}
 .timer{font-weight:700}
+.diff{font-family:ui-monospace,Menlo,Consolas,monospace;white-space:pre-wrap}
+.diff .d-sub{color:#ff6b6b;text-decoration:underline} .diff .d-acc{color:#ffc857;text-decoration:underline}
+.diff .d-miss{background:rgba(255,107,107,.25);color:#ff6b6b} .diff .d-extra{color:var(--muted)}
+.quiz-mode .fr{visibility:hidden}
+.vlist{position:relative}
+.vlist>.grid{position:absolute;left:0;right:0;top:0;will-change:transform}
+.vlist .texts>div{min-width:0}
+.vlist .pt,.vlist .fr,.vlist .phon{overflow-wrap:anywhere}
 @media (max-width:640px){.card{grid-template-columns:1fr}.actions{justify-content:flex-start}}
 """
@@ -1,19 +1,226 @@
 def get_base_js_common() -> str:
-    return """const player = document.getElementById('player');
-function play(src){ player.src = src; player.play(); }
-function stopAudio(){ try{ player.pause(); player.currentTime = 0; }catch(e){} }
-function filterCards(){
-  const q=(document.getElementById('search')?.value||'').trim().toLowerCase();
-  const cards=document.querySelectorAll('#list .card');
-  if(!q){ cards.forEach(c=>c.style.display=''); return; }
-  cards.forEach(c=>{
-    const pt=c.getAttribute('data-pt'), fr=c.getAttribute('data-fr');
-    c.style.display = (pt.includes(q) || fr.includes(q)) ? '' : 'none';
+    return """// ---- Audio : éléments préchargés (LRU), le quiz et la dictée réchauffent les prochains items ----
+const AUDIO_PREFETCH = 3;          // items préchargés après celui en cours
+const AUDIO_CACHE_SIZE = 8;        // éléments Audio gardés (les plus anciens sont libérés)
+const audioCache = new Map();      // src -> Audio, ordre d'insertion = ordre d'utilisation
+const audioLatency = [];           // { src, ms, warm } : délai entre play() et le début du son
+let player = document.getElementById('player');
+function audioFor(src){
+  let a = audioCache.get(src);
+  if (a){ audioCache.delete(src); audioCache.set(src, a); return a; }
+  a = new Audio(); a.preload = 'auto'; a.src = src;
+  audioCache.set(src, a);
+  if (audioCache.size > AUDIO_CACHE_SIZE){
+    const [oldSrc, old] = audioCache.entries().next().value;
+    audioCache.delete(oldSrc);
+    if (old !== player){ old.removeAttribute('src'); old.load(); }   // libère le tampon décodé
+  }
+  return a;
+}
+// ---- Sprites : clips d'une leçon regroupés dans un seul MP3 (22_utils_audio_sprites.py), lus par position ----
+const spriteClips = {};            // src du clip -> { file, start, dur }
+const spriteBroken = new Set();    // sprites illisibles : retour aux fichiers individuels
+let clipTimer = 0, playToken = 0;
+function registerSprites(data){
+  for (const s of (data && data.sprites) || []){
+    for (const c of s.clips) spriteClips[c[0]] = { file: s.file, start: c[1], dur: c[2] };
+  }
+}
+function spriteClip(src){ const c = spriteClips[src]; return (c && !spriteBroken.has(c.file)) ? c : null; }
+function prefetchAudio(srcs){
+  srcs.slice(0, AUDIO_PREFETCH).forEach(src => { if (src){ const c = spriteClip(src); audioFor(c ? c.file : src); } });
+}
+// `onStart(ms, warm)` : appelé au début effectif du son (mesures par question, voir QuestionTimer)
+function play(src, onStart){
+  stopAudio();
+  const clip = spriteClip(src), token = ++playToken, a = audioFor(clip ? clip.file : src);
+  player = a;
+  const t0 = performance.now(), warm = a.readyState >= 3;   // HAVE_FUTURE_DATA : déjà chargé
+  a.addEventListener('playing', () => {
+    if (token !== playToken) return;   // lecture remplacée entre-temps
+    audioLatency.push({ src, ms: Math.round(performance.now() - t0), warm });
+    if (onStart) onStart(performance.now() - t0, warm);
+    if (clip) clipTimer = setTimeout(() => a.pause(), clip.dur * 1000 / (a.playbackRate || 1));
+  }, { once: true });
+  if (clip){
+    a.currentTime = clip.start;
+    // Filet de sécurité si le minuteur est en retard (onglet en arrière-plan...)
+    a.ontimeupdate = () => { if (token === playToken && a.currentTime >= clip.start + clip.dur) a.pause(); };
+    a.onerror = () => { spriteBroken.add(clip.file); if (token === playToken) play(src); };
+  } else {
+    a.ontimeupdate = null; a.onerror = null;
+  }
+  const p = a.play();
+  if (p && p.catch) p.catch(() => {});
+}
+function stopAudio(){ clearTimeout(clipTimer); try{ player.pause(); player.currentTime = 0; }catch(e){} }
+function audioStats(){
+  const ms = audioLatency.map(x => x.ms).sort((a, b) => a - b);
+  return { count: ms.length, warm: audioLatency.filter(x => x.warm).length,
+           median: ms.length ? ms[ms.length >> 1] : 0, max: ms.length ? ms[ms.length - 1] : 0 };
+}
+function audioStatsText(){
+  const s = audioStats();
+  return s.count ? `🔊 Démarrage audio : médiane ${s.median} ms, max ${s.max} ms (${s.warm}/${s.count} préchargés)` : '';
+}
+
+// ---- Mesures par question (quiz et dictée) : history, performance.mark/measure, export JSON ----
+// Marques "mq:<kind>:<n>:shown|audio|input|answer", mesures "mq:<kind>:<n>:audio|input|answer" (depuis shown)
+function QuestionTimer(kind){
+  const perf = (typeof performance !== 'undefined' && performance.mark && performance.measure) ? performance : null;
+  const prefix = 'mq:' + kind + ':';
+  let cur = null, seq = 0;
+  if (perf && perf.getEntriesByType){   // une seule partie à la fois dans la chronologie
+    for (const e of perf.getEntriesByType('mark')) if (e.name.startsWith(prefix)) perf.clearMarks(e.name);
+    for (const e of perf.getEntriesByType('measure')) if (e.name.startsWith(prefix)) perf.clearMeasures(e.name);
+  }
+  const ms1 = x => x === null ? null : Math.round(x * 10) / 10;   // 0,1 ms
+  function mark(q, what){
+    if (!perf) return;
+    try { perf.mark(prefix + q.n + ':' + what); if (what !== 'shown') perf.measure(prefix + q.n + ':' + what, prefix + q.n + ':shown', prefix + q.n + ':' + what); }
+    catch (e) { /* marque effacée (nouvelle partie) */ }
+  }
+  return {
+    // Question affichée (avant play) ; retourne le rappel à passer à play()
+    shown(){
+      const q = cur = { n: ++seq, t0: performance.now(), audio: null, warm: null, input: null };
+      mark(q, 'shown');
+      return (ms, warm) => { if (q.audio === null){ q.audio = ms; q.warm = warm; mark(q, 'audio'); } };
+    },
+    // Première saisie (clic, touche) de la question en cours
+    input(){ if (cur && cur.input === null){ cur.input = performance.now() - cur.t0; mark(cur, 'input'); } },
+    // Réponse (ou temps écoulé) : champs ajoutés à l'entrée de history
+    answer(timeout){
+      const q = cur; cur = null;
+      if (!q) return { ms: 0, timeout: !!timeout, audioMs: null, inputMs: null };
+      mark(q, 'answer');
+      return { ms: ms1(performance.now() - q.t0), timeout: !!timeout, audioMs: ms1(q.audio), audioWarm: q.warm, inputMs: ms1(q.input) };
+    },
+  };
+}
+function medianOf(xs){ const v = xs.filter(x => x !== null && x !== undefined).sort((a, b) => a - b); return v.length ? v[v.length >> 1] : null; }
+// Résumé des mesures d'une partie, affiché sous le score
+function timingStatsText(history){
+  const answered = history.filter(e => !e.timeout), timeouts = history.length - answered.length;
+  const ans = medianOf(answered.map(e => e.ms)), inp = medianOf(history.map(e => e.inputMs));
+  if (ans === null && !timeouts) return '';
+  return `⏱️ Réponse : médiane ${ans === null ? '—' : (ans / 1000).toFixed(1) + ' s'}`
+    + (inp === null ? '' : `, 1re saisie ${(inp / 1000).toFixed(1)} s`)
+    + ` ; temps écoulé : ${timeouts}/${history.length}`
+    + ` <button onclick="downloadTimings()">⬇️ Mesures (JSON)</button>`;
+}
+let lastSession = null;   // dernière partie terminée, pour l'export
+function endSession(kind, history, limitMs){
+  lastSession = { kind, page: location.pathname.split('/').pop(), at: new Date().toISOString(), limitMs,
+                  userAgent: navigator.userAgent, audio: audioStats(), clips: audioLatency.slice(), items: history };
+}
+function downloadTimings(){
+  if (!lastSession) return;
+  const a = document.createElement('a');
+  a.href = URL.createObjectURL(new Blob([JSON.stringify(lastSession, null, 1)], { type: 'application/json' }));
+  a.download = 'mesures-' + lastSession.kind + '-' + lastSession.at.slice(0, 19).replace(/[:T]/g, '-') + '.json';
+  document.body.appendChild(a); a.click(); a.remove();
+  setTimeout(() => URL.revokeObjectURL(a.href), 1000);
+}
+
+// ---- Recherche : texte normalisé (sans accents) + index de trigrammes ----
+// Mêmes règles que 20_utils_search_index.py (qui précalcule l'index de l'accueil).
+function foldText(s){
+  return String(s||'').normalize('NFD').replace(/[\\u0300-\\u036f]/g,'').toLowerCase().replace(/\\s+/g,' ').trim();
+}
+function SearchIndex(data){
+  const N = data.n || 3, keys = data.keys, grams = data.grams, decoded = {};
+  let last = null;   // dernière recherche : une saisie qui la prolonge ne filtre que ses résultats
+  function postings(g){
+    let p = decoded[g];
+    if (p === undefined){
+      const s = grams[g];
+      if (typeof s === 'string'){   // écarts en base 36 (format du build)
+        p = []; let acc = 0;
+        for (const d of s.split(',')){ acc += parseInt(d, 36); p.push(acc); }
+      } else p = s || [];
+      decoded[g] = p;
+    }
+    return p;
+  }
+  function intersect(a, b){
+    const out = []; let i = 0, j = 0;
+    while (i < a.length && j < b.length){
+      if (a[i] === b[j]){ out.push(a[i]); i++; j++; }
+      else if (a[i] < b[j]) i++; else j++;
+    }
+    return out;
+  }
+  this.size = keys.length;
+  // Indices (croissants) des clés contenant tous les termes de q ; null si q est vide (tout afficher)
+  this.query = function(q){
+    const fq = foldText(q);
+    if (!fq){ last = null; return null; }
+    const terms = fq.split(' ');
+    let cand = (last && fq.startsWith(last.q)) ? last.hits : null;
+    for (const t of terms){
+      for (let j = 0; j + N <= t.length; j++){
+        const p = postings(t.substr(j, N));
+        cand = cand ? intersect(cand, p) : p;
+        if (!cand.length) break;
+      }
+    }
+    // Un terme de N lettres est entièrement résolu par l'index ; les autres sont vérifiés sur la clé
+    const check = terms.filter(t => t.length !== N);
+    let hits = [];
+    if (cand && !check.length) hits = cand.slice();
+    else if (cand){ for (const i of cand) if (check.every(t => keys[i].includes(t))) hits.push(i); }
+    else {
+      for (let i = 0; i < keys.length; i++){
+        const k = keys[i]; let ok = true;
+        for (const t of check) if (!k.includes(t)){ ok = false; break; }
+        if (ok) hits.push(i);
+      }
+    }
+    last = { q: fq, hits };
+    return hits;
+  };
+}
+// Index construit dans le navigateur (cartes d'une leçon, banc d'essai) ; même format que le build
+SearchIndex.build = function(keys, n){
+  n = n || 3;
+  const grams = {};
+  keys.forEach((k, i) => {
+    for (let j = 0; j + n <= k.length; j++){
+      const g = k.substr(j, n), p = grams[g];
+      if (p){ if (p[p.length - 1] !== i) p.push(i); continue; }   // déjà vu pour cette clé
+      if (g.includes(' ') || g.includes('\\n')) continue;
+      grams[g] = [i];
+    }
   });
+  return new SearchIndex({ n, keys, grams });
+};
+function searchKey(pt, fr, phon){ return [pt, fr, phon].map(foldText).join('\\n'); }
+
+const SEARCH_DEBOUNCE_MS = 120;
+let searchTimer = 0, cardSearch = null;
+function filterCards(){
+  clearTimeout(searchTimer);
+  searchTimer = setTimeout(runSearch, SEARCH_DEBOUNCE_MS);
+}
+function runSearch(){
+  const q = document.getElementById('search')?.value || '';
+  if (window.wordList){ wordList.setView(wordList.index.query(q)); return; }   // accueil : liste virtualisée
+  if (!cardSearch){
+    const cards = Array.from(document.querySelectorAll('#list .card'));
+    const keys = cards.map(c => c.getAttribute('data-k') || searchKey(c.getAttribute('data-pt'), c.getAttribute('data-fr'), ''));
+    cardSearch = { cards, index: SearchIndex.build(keys), shown: new Uint8Array(cards.length).fill(1) };
+  }
+  // Seules les cartes dont l'état change sont touchées
+  const { cards, index, shown } = cardSearch, hits = index.query(q);
+  const want = new Uint8Array(cards.length);
+  if (hits === null) want.fill(1); else for (const i of hits) want[i] = 1;
+  for (let i = 0; i < cards.length; i++){
+    if (want[i] !== shown[i]){ cards[i].style.display = want[i] ? '' : 'none'; shown[i] = want[i]; }
+  }
 }
 function toggleQuiz(){
   const chk=document.getElementById('quiz');
-  const frs=document.querySelectorAll('.fr');
-  frs.forEach(el=>{ el.style.visibility = chk.checked ? 'hidden' : 'visible'; });
+  document.body.classList.toggle('quiz-mode', chk.checked);   // s'applique aussi aux cartes créées ensuite
 }
 """
@@ -1,19 +1,31 @@
 # 04_assets_quiz_js.py
 # - Le POOL est fourni par la page (clé "phon" incluse, comme pour les leçons)
+# - Questions choisies par la répétition espacée (Scheduler, 27_assets_srs_js.py) : mots dus d'abord
+# - Audio : les prochaines questions sont préchargées (prefetchAudio, voir 03_assets_base_js_common.py)
+# - Distracteurs : voisins précalculés (item.hard) + tirage par rejet, sans copie du pool par question
 # - Feedback détaillé après chaque question (PT / phon / FR)
-# - Récapitulatif final avec statut ✅/❌
+# - Mesures par question dans history (QuestionTimer, 03_assets_base_js_common.py) : démarrage audio,
+#   première saisie, temps de réponse, temps écoulé ; export JSON depuis le récapitulatif
+# - Récapitulatif final avec statut ✅/❌ ; partie enregistrée pour stats.html (saveResults, 28_assets_results_js.py)
 # - +3 secondes d’affichage de la réponse avant la suivante
 # - Pas de f-string autour des blocs JS pour éviter les soucis d’accolades
 
 def make_quiz_js(timer_seconds: int = 8, auto_delay_ms: int = 900) -> str:
     return (
         "function shuffle(a){ for(let i=a.length-1;i>0;i--){const j=Math.floor(Math.random()*(i+1));[a[i],a[j]]=[a[j],a[i]];} return a; }\n"
-        "function makeQuiz(POOL, limit){ const items=[...POOL]; shuffle(items); if(limit&&limit>0){ items.length=Math.min(limit,items.length);} return items; }\n"
-        "function buildChoices(pool, answer, n=4){\n"
-        "  const others = pool.filter(x => x.pt !== answer.pt);\n"
-        "  shuffle(others);\n"
-        "  const picks = others.slice(0, Math.max(0, n-1));\n"
-        "  return shuffle([...picks, answer]);\n"
+        "// Propositions pour POOL[ai], sans parcourir le pool : voisins \"difficiles\" précalculés au build\n"
+        "// (item.hard : mots proches à l'orthographe), puis tirage aléatoire par rejet dans tout le pool.\n"
+        "function buildChoices(pool, ai, n=4){\n"
+        "  const answer = pool[ai], picked = [ai];\n"
+        "  const ok = j => j >= 0 && j < pool.length && !picked.includes(j) && pool[j].pt !== answer.pt;\n"
+        "  let hardLeft = Math.max(0, n - 2);   // au moins une proposition au hasard\n"
+        "  for (const j of shuffle((answer.hard || []).slice())){ if (!hardLeft) break; if (ok(j)){ picked.push(j); hardLeft--; } }\n"
+        "  for (let tries = 0; picked.length < n && tries < 32 * n; tries++){\n"
+        "    const j = Math.floor(Math.random() * pool.length);\n"
+        "    if (ok(j)) picked.push(j);\n"
+        "  }\n"
+        "  for (let j = 0; picked.length < n && j < pool.length; j++) if (ok(j)) picked.push(j);   // petit pool, doublons\n"
+        "  return shuffle(picked.map(j => pool[j]));\n"
         "}\n"
         "// --- Accès direct comme les leçons : la phonétique est dans item.phon ---\n"
         "function getPhon(x){ return (x && typeof x.phon === 'string') ? x.phon : ''; }\n"
@@ -23,9 +35,10 @@ def make_quiz_js(timer_seconds: int = 8, auto_delay_ms: int = 900) -> str:
         "  const AUTO_DELAY_MS = " + str(auto_delay_ms) + ";\n"
         "  const EXTRA_FEEDBACK_MS = 3000; // +3s d'affichage de la réponse\n"
         "  const TIMER_LIMIT_S = " + str(timer_seconds) + ";\n"
-        "  const state = { pool:config.pool, idx:0, score:0, total:config.total, optionsCount:4,\n"
+        "  // source : POOL complet (distracteurs) ; order/pool : questions tirées pour cette partie ; srs : planificateur\n"
+        "  const state = { source:config.pool, order:[], pool:config.pool, idx:0, score:0, total:config.total, optionsCount:4,\n"
         "                  started:false, paused:false, timerNext:null, countdown:TIMER_LIMIT_S,\n"
-        "                  countdownInterval:null, answered:false, history:[] };\n"
+        "                  countdownInterval:null, answered:false, history:[], srs:null, timer:null };\n"
         "  const elBtnStart   = document.getElementById('btn-start');\n"
         "  const elBtnPause   = document.getElementById('btn-pause');\n"
         "  const elBtnResume  = document.getElementById('btn-resume');\n"
@@ -75,7 +88,7 @@ def make_quiz_js(timer_seconds: int = 8, auto_delay_ms: int = 900) -> str:
         "    elScore.textContent = state.score;\n"
         "    elResult.textContent = \"\";\n"
         "    elChoices.innerHTML = \"\";\n"
-        "    const opts = buildChoices(state.pool, cur, state.optionsCount);\n"
+        "    const opts = buildChoices(state.source, state.order[state.idx], state.optionsCount);\n"
         "    opts.forEach(opt => {\n"
         "      const btn = document.createElement('button');\n"
         "      btn.className = 'choice';\n"
@@ -85,7 +98,8 @@ def make_quiz_js(timer_seconds: int = 8, auto_delay_ms: int = 900) -> str:
         "    });\n"
         "    if (!state.paused) {\n"
         "      stopAudio();\n"
-        "      play(cur.normal);\n"
+        "      play(cur.normal, state.timer.shown());\n"
+        "      prefetchAudio(state.pool.slice(state.idx + 1, state.idx + 1 + AUDIO_PREFETCH).map(x => x.normal));\n"
         "      startCountdown();\n"
         "    }\n"
         "  }\n"
@@ -117,7 +131,7 @@ def make_quiz_js(timer_seconds: int = 8, auto_delay_ms: int = 900) -> str:
         "    elScore.textContent = state.score;\n"
         "    const item = state.pool[state.idx];\n"
         "    showFeedback(item, isCorrect);\n"
-        "    state.history.push({ pt: item.pt || '', phon: getPhon(item), fr: getFr(item), correct: !!isCorrect });\n"
+        "    record(item, !!isCorrect, false);\n"
         "    scheduleNext();\n"
         "  }\n"
         "  function onTimeout(){\n"
@@ -126,9 +140,16 @@ def make_quiz_js(timer_seconds: int = 8, auto_delay_ms: int = 900) -> str:
         "    lockChoices(); markCorrect();\n"
         "    const item = state.pool[state.idx];\n"
         "    showFeedback(item, false);\n"
-        "    state.history.push({ pt: item.pt || '', phon: getPhon(item), fr: getFr(item), correct: false });\n"
+        "    record(item, false, true);\n"
         "    scheduleNext();\n"
         "  }\n"
+        "  // Réponse enregistrée dans history, qui alimente la répétition espacée\n"
+        "  function record(item, correct, timeout){\n"
+        "    const e = Object.assign({ id: item.id || '', pt: item.pt || '', phon: getPhon(item), fr: getFr(item), correct,\n"
+        "                              limitMs: TIMER_LIMIT_S * 1000 }, state.timer.answer(timeout));\n"
+        "    state.history.push(e);\n"
+        "    state.srs.review(state.order[state.idx], srsQuality(e));\n"
+        "  }\n"
         "  function buildSummary(entries){\n"
         "    const rows = entries.map((e,i)=>{\n"
         "      const status = e.correct ? '✅' : '❌';\n"
@@ -138,14 +159,17 @@ def make_quiz_js(timer_seconds: int = 8, auto_delay_ms: int = 900) -> str:
         "           + `<td>${e.pt || ''}</td>`\n"
         "           + `<td>${e.phon || '—'}</td>`\n"
         "           + `<td>${e.fr || '—'}</td>`\n"
+        "           + `<td>${e.timeout ? '⏱️' : (e.ms / 1000).toFixed(1) + ' s'}</td>`\n"
         "           + `</tr>`;\n"
         "    }).join('');\n"
         "    const score = `${state.score} / ${state.total}`;\n"
         "    return (\n"
         "      `<div class=\"summary\">`\n"
         "      + `<div class=\"summary-title\">🎉 Terminé ! Score : ${score}</div>`\n"
+        "      + `<div class=\"small\">${audioStatsText()}</div>`\n"
+        "      + `<div class=\"small\">${timingStatsText(entries)}</div>`\n"
         "      + `<table class=\"summary-table\">`\n"
-        "      + `<thead><tr><th>#</th><th>OK</th><th>Portugais</th><th>Phonétique</th><th>Français</th></tr></thead>`\n"
+        "      + `<thead><tr><th>#</th><th>OK</th><th>Portugais</th><th>Phonétique</th><th>Français</th><th>Temps</th></tr></thead>`\n"
         "      + `<tbody>${rows}</tbody>`\n"
         "      + `</table>`\n"
         "      + `</div>`\n"
@@ -155,18 +179,28 @@ def make_quiz_js(timer_seconds: int = 8, auto_delay_ms: int = 900) -> str:
         "    clearTimers();\n"
         "    if (state.idx + 1 >= state.total){\n"
         "      elChoices.innerHTML = \"\";\n"
+        "      endSession('quiz', state.history, TIMER_LIMIT_S * 1000);\n"
         "      elResult.innerHTML = buildSummary(state.history);\n"
+        "      saveResults('quiz', state.history, location.pathname.split('/').pop());\n"
         "      setButtons();\n"
         "      return;\n"
         "    }\n"
         "    state.idx += 1; render();\n"
         "  }\n"
+        "  // Première saisie : clic ou touche sur les propositions\n"
+        "  const onInput = () => { if (state.timer && state.answered === false) state.timer.input(); };\n"
+        "  elChoices.addEventListener('pointerdown', onInput);\n"
+        "  elChoices.addEventListener('keydown', onInput);\n"
         "  // Controls\n"
         "  elBtnStart.onclick = () => {\n"
         "    const sel = document.getElementById('qcount');\n"
         "    const total = parseInt(sel.value, 10) || 10;\n"
         "    state.history = [];\n"
-        "    state.pool = makeQuiz(state.pool, total);\n"
+        "    state.timer = QuestionTimer('quiz');\n"
+        "    if (!state.srs) state.srs = Scheduler(state.source);\n"
+        "    state.srs.release(state.order);   // questions tirées mais sans réponse (partie précédente)\n"
+        "    state.order = state.srs.take(total);\n"
+        "    state.pool = state.order.map(i => state.source[i]);\n"
         "    state.total = state.pool.length;\n"
         "    state.idx = 0; state.score = 0; state.started = true; state.paused = false;\n"
         "    clearTimers(); stopAudio(); elConfig.style.display = 'none'; elStage.style.display = 'block';\n"
@@ -174,7 +208,7 @@ def make_quiz_js(timer_seconds: int = 8, auto_delay_ms: int = 900) -> str:
         "  };\n"
         "  elBtnPause.onclick = () => { state.paused = true; clearTimers(); stopAudio(); setButtons(); };\n"
         "  elBtnResume.onclick = () => { state.paused = false; setButtons(); render(); };\n"
-        "  elBtnRestart.onclick = () => { clearTimers(); state.started=false; state.paused=false; state.idx=0; state.score=0; stopAudio(); elStage.style.display='none'; elConfig.style.display='block'; setButtons(); };\n"
+        "  elBtnRestart.onclick = () => { clearTimers(); if (state.srs) state.srs.release(state.order); state.started=false; state.paused=false; state.idx=0; state.score=0; stopAudio(); elStage.style.display='none'; elConfig.style.display='block'; setButtons(); };\n"
         "  setButtons();\n"
         "}\n"
         "function startQuiz(POOL){ QuizApp({ pool: POOL, total: POOL.length }); }\n"
@@ -1,5 +1,66 @@
+import hashlib
 import json
 from pathlib import Path
+from typing import Iterator, Optional
 
 def load_json(path: Path):
     return json.loads(path.read_text(encoding="utf-8"))
+
+# Manifeste global : deux formats acceptés
+# - version 2 : manifest_global.json, un document {"version": 2, "count", "words": [...]} (lu d'un bloc)
+# - version 3 : manifest_global.jsonl, JSON Lines : une ligne d'en-tête {"version": 3, "count"}, puis un mot par ligne
+#   (lu en flux : les mots ne sont jamais tous en mémoire à la fois)
+MANIFEST_JSONL = "manifest_global.jsonl"
+MANIFEST_JSON = "manifest_global.json"
+
+class Manifest:
+    """Lecteur du manifeste global, quel que soit son format ; itérer dessus donne les mots dans l'ordre."""
+    def __init__(self, path: Optional[Path] = None, document: Optional[dict] = None):
+        self.path = path
+        self._document = document
+        if document is None:
+            with path.open(encoding="utf-8") as f:
+                first = f.readline()
+            try:
+                head = json.loads(first)
+            except ValueError:
+                head = None   # document indenté (version 2) : la première ligne n'est pas un objet complet
+            if isinstance(head, dict) and head.get("version", 0) >= 3:
+                if head["version"] != 3:
+                    raise SystemExit(f"[ERREUR] version de manifeste non prise en charge : {head['version']} ({path})")
+                self.header = head
+            else:
+                self._document = load_json(path)
+        if self._document is not None:
+            doc = self._document
+            self.header = {"version": doc.get("version", 2), "count": doc.get("count", len(doc.get("words") or []))}
+        self.version = self.header.get("version")
+        self.count = self.header.get("count", 0)
+
+    def __iter__(self) -> Iterator[dict]:
+        if self._document is not None:
+            yield from (self._document.get("words") or [])
+            return
+        with self.path.open(encoding="utf-8") as f:
+            f.readline()   # en-tête
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def fingerprint(self) -> str:
+        """Empreinte du contenu (clé du cache de build), calculée sans charger les mots."""
+        h = hashlib.sha1()
+        if self.path is not None:
+            with self.path.open("rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+        else:
+            h.update(json.dumps(self._document, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+        return h.hexdigest()
+
+def open_manifest(root: Path) -> Manifest:
+    """Manifeste de `root` : manifest_global.jsonl (version 3) s'il existe, sinon manifest_global.json."""
+    for name in (MANIFEST_JSONL, MANIFEST_JSON):
+        if (root / name).exists():
+            return Manifest(root / name)
+    raise SystemExit(f"[ERREUR] introuvable : {root / MANIFEST_JSON} (ni {MANIFEST_JSONL})")
@@ -1,17 +1,80 @@
+import os
 from html import escape
 from pathlib import Path
 from assets_base_css import get_base_css
 from assets_base_js_common import get_base_js_common
+from assets_word_list_js import get_word_list_js
 
-def write_html(out_path: Path, title: str, subtitle: str, body_html: str, extra_js: str = "", home_link=True):
+# Fichiers produits par ce processus : écrits, ou laissés tels quels car identiques (bilan : write_report)
+_WRITES = {"written": 0, "written_bytes": 0, "skipped": 0, "skipped_bytes": 0}
+
+def write_if_changed(path: Path, content) -> bool:
+    """
+    Écrit `content` (str ou bytes) dans `path` seulement s'il diffère du fichier existant :
+    un fichier identique garde sa date (caches navigateur/CDN, `git add .` sans bruit).
+    Écriture atomique (fichier temporaire puis renommage) : jamais de fichier à moitié écrit.
+    Retourne True si le fichier a été écrit.
+    """
+    if isinstance(content, str):
+        content = content.replace("\n", os.linesep).encode("utf-8")   # mêmes octets que write_text()
+    try:
+        same = path.stat().st_size == len(content) and path.read_bytes() == content
+    except OSError:
+        same = False
+    if same:
+        _WRITES["skipped"] += 1
+        _WRITES["skipped_bytes"] += len(content)
+        return False
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(content)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    _WRITES["written"] += 1
+    _WRITES["written_bytes"] += len(content)
+    return True
+
+def write_stats() -> dict:
+    return dict(_WRITES)
+
+def merge_write_stats(stats: dict):
+    """Ajoute le bilan d'un processus fils (--jobs)."""
+    for k, v in stats.items():
+        _WRITES[k] += v
+
+def write_report() -> str:
+    w = _WRITES
+    return (f"💾 Écritures : {w['written']} fichier(s), {w['written_bytes'] / 1024:.0f} Ko écrits ; "
+            f"{w['skipped']} identique(s), {w['skipped_bytes'] / 1024:.0f} Ko non réécrits")
+
+def write_html(out_path: Path, title: str, subtitle: str, body_html: str, extra_js: str = "", home_link=True,
+               assets=None, scripts=(), script_srcs=()):
+    """
+    `assets` : AssetBundle (18_assets_pipeline.py) fournissant "base" (CSS) et "common" (JS),
+    plus les scripts nommés dans `scripts` (ex: "quiz"), chargés avant `extra_js`.
+    `script_srcs` : autres fichiers JS (ex: données pools/<scope>.<hash>.js), chargés juste avant `extra_js`.
+    Sans `assets`, CSS et JS communs (et la liste de l'accueil) sont recopiés dans la page.
+    """
     home_btn = '<a class="btn" href="index.html">🏠 Accueil</a>' if home_link else ''
+    if assets is None:
+        css_tag = f"<style>{get_base_css()}</style>"
+        js_tags = f"<script>{get_base_js_common()}</script>"
+        if "wordlist" in scripts:
+            js_tags += f"\n  <script>{get_word_list_js()}</script>"
+    else:
+        css_tag = assets.tag("base")
+        js_tags = "\n  ".join(assets.tag(name) for name in ("common", *scripts))
+    for src in script_srcs:
+        js_tags += f'\n  <script src="{escape(src)}"></script>'
     html = f"""<!DOCTYPE html>
 <html lang="fr">
 <head>
   <meta charset="utf-8" />
   <title>{escape(title)}</title>
   <meta name="viewport" content="width=device-width, initial-scale=1" />
-  <style>{get_base_css()}</style>
+  {css_tag}
 </head>
 <body>
   <div class="container">
@@ -24,9 +87,9 @@ def write_html(out_path: Path, title: str, subtitle: str, body_html: str, extra_
   </div>
   <div class="footer">Pages statiques — ouvrez localement sans serveur.</div>
   <audio id="player" preload="auto"></audio>
-  <script>{get_base_js_common()}</script>
+  {js_tags}
   <script>{extra_js}</script>
 </body>
 </html>
 """
-    out_path.write_text(html, encoding="utf-8")
+    write_if_changed(out_path, html)
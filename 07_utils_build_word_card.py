@@ -1,10 +1,13 @@
 from html import escape
+from utils_search_index import search_key
 
 def build_word_card(idx, pt, fr, phon, file_normal, file_slow=""):
     pt_esc, fr_esc = escape(pt), escape(fr)
     phon_esc = escape(phon) if phon else ""
     btn_slow = f'<button onclick="play(\'{escape(file_slow)}\')">🐢 Lent</button>' if file_slow else ''
-    return f"""    <div class="card" data-pt="{pt_esc.lower()}" data-fr="{fr_esc.lower()}">
+    # data-k : clé de recherche normalisée (sans accents), indexée par filterCards
+    key_esc = escape(search_key(pt, fr, phon or "")).replace("\n", "&#10;")
+    return f"""    <div class="card" data-pt="{pt_esc.lower()}" data-fr="{fr_esc.lower()}" data-k="{key_esc}">
       <div class="texts">
         <div class="label badge">{idx}</div>
         <div>
@@ -1,11 +1,24 @@
+import json
 from html import escape
 from pathlib import Path
 from utils_write_html import write_html
-from utils_build_word_card import build_word_card
+from pages_to_quiz_pool_js import write_pool_file
+from utils_search_index import to_search_index_js
 
-def build_index(root: Path, out_dir: Path, title: str, global_manifest: dict, lessons_index: dict):
-    words = global_manifest.get("words", [])
-    total_words = len(words); total_lessons = len(lessons_index)
+def to_word_list_js(words) -> str:
+    """Liste compacte [[pt, fr, phon, normal, slow], ...] pour la liste virtualisée de l'accueil."""
+    arr = []
+    for w in words:
+        files = w.get("files", {}) or {}
+        arr.append([w.get("pt",""), w.get("fr",""), w.get("phon",""), files.get("normal",""), files.get("slow","")])
+    return json.dumps(arr, ensure_ascii=False, separators=(",", ":"))
+
+def build_index(ctx, out_dir: Path, title: str, assets=None, cache=None):
+    lessons_index = ctx.lessons_index
+    out_path = out_dir / "index.html"
+    if cache is not None and not cache.need(out_path, title, ctx.words_key, lessons_index, assets and assets.key("wordlist")):
+        return
+    total_words = ctx.word_count; total_lessons = len(lessons_index)
 
     lesson_cards = []
     for lid, lec in lessons_index.items():
@@ -27,12 +40,15 @@ def build_index(root: Path, out_dir: Path, title: str, global_manifest: dict, le
         </div>
         """)
 
-    all_cards = []
-    for i, w in enumerate(words, start=1):
-        pt, fr = w.get("pt",""), w.get("fr","")
-        phon = w.get("phon","")
-        files = w.get("files", {})
-        all_cards.append(build_word_card(i, pt, fr, phon, files.get("normal",""), files.get("slow","")))
+    # "Tous les mots" : données à part (fichier partagé, ou inline), cartes créées à l'affichage.
+    # L'index de recherche précalculé accompagne le fichier de données ; inline, il est construit par le navigateur.
+    words_js = to_word_list_js(ctx.iter_words())
+    if assets is not None and not assets.inline:
+        srcs = (write_pool_file(out_dir, "_words", words_js, var_name="WORDS"),
+                write_pool_file(out_dir, "_search", to_search_index_js(ctx.iter_words()), var_name="SEARCH"))
+        extra_js = "startWordList(WORDS, SEARCH);"
+    else:
+        srcs, extra_js = (), f"const WORDS = {words_js};\nstartWordList(WORDS);"
 
     body = f"""    <div class="card">
       <div class="texts">
@@ -45,6 +61,7 @@ def build_index(root: Path, out_dir: Path, title: str, global_manifest: dict, le
       <div class="actions">
         <a class="btn" href="quiz.html">🎧 Quiz global</a>
         <a class="btn" href="dictation.html">⌨️ Dictée globale</a>
+        <a class="btn" href="stats.html">📊 Statistiques</a>
       </div>
     </div>
 
@@ -53,9 +70,12 @@ def build_index(root: Path, out_dir: Path, title: str, global_manifest: dict, le
 
     <h2 id="all">Tous les mots</h2>
     <div class="toolbar">
-      <input id="search" type="text" placeholder="Rechercher (PT ou FR)..." oninput="filterCards()" />
+      <input id="search" type="text" placeholder="Rechercher (PT, FR ou phonétique)..." oninput="filterCards()" />
       <label><input id="quiz" type="checkbox" onchange="toggleQuiz()"> Mode Quiz (cacher FR)</label>
     </div>
-    <div id="list" class="grid">{''.join(all_cards)}</div>
+    <div id="list" class="vlist"></div>
     """
-    write_html(out_dir / "index.html", title, "Navigue dans les leçons, entraîne-toi au quiz ou à la dictée.", body, home_link=False)
+    write_html(out_path, title, "Navigue dans les leçons, entraîne-toi au quiz ou à la dictée.", body, extra_js,
+               home_link=False, assets=assets, scripts=("wordlist",), script_srcs=srcs)
+    if cache is not None:
+        cache.produced(out_path, *srcs)   # pools/_words, pools/_search : page régénérée s'ils disparaissent
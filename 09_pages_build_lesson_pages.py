@@ -1,5 +1,5 @@
 # 09_pages_build_lesson_pages.py
-# Génère les pages "leçon" en s'appuyant sur global_manifest["words"]
+# Génère les pages "leçon" en s'appuyant sur le contexte de build (mots du manifeste déjà résolus)
 # - Chargement robuste des utilitaires (même si les fichiers commencent par un chiffre)
 # - Intègre la phonétique via w.get("phon","") — identique à la logique des leçons
 # - Ajoute un lien direct vers le quiz et la dictée de la leçon
@@ -9,7 +9,7 @@ from __future__ import annotations
 from pathlib import Path
 import importlib.util
 import sys
-from typing import Any, Dict, List
+from typing import Any, List
 
 # -----------------------------
 # Chargement robuste d'un module
@@ -23,6 +23,11 @@ def _load_attr_from_candidates(attr_name: str, candidates: List[str]) -> Any:
     here = Path(__file__).parent.resolve()
 
     for cand in candidates:
+        # Module déjà chargé sous cet alias (01_main.py) : le même objet, pas une seconde copie
+        loaded = sys.modules.get(cand)
+        if loaded is not None and hasattr(loaded, attr_name):
+            return getattr(loaded, attr_name)
+
         # Normaliser en fichier .py
         filename = cand if cand.endswith(".py") else f"{cand}.py"
         path = here / filename
@@ -68,11 +73,11 @@ build_word_card = _load_attr_from_candidates(
     ],
 )
 
-load_json = _load_attr_from_candidates(
-    "load_json",
+BuildContext = _load_attr_from_candidates(
+    "BuildContext",
     [
-        "utils_load_json",
-        "05_utils_load_json",
+        "utils_build_context",
+        "17_utils_build_context",
     ],
 )
 
@@ -80,54 +85,54 @@ load_json = _load_attr_from_candidates(
 # Générateur des pages de leçon
 # -----------------------------
 def build_lesson_pages(
-    root: Path,
+    ctx: Any,
     out_dir: Path,
-    lessons_index: Dict[str, Any],
-    global_manifest: Dict[str, Any],
+    assets: Any = None,
+    cache: Any = None,
 ) -> None:
     """
     Génère une page HTML par leçon.
 
     Paramètres
     ----------
-    root : Path
-        Dossier racine contenant les données (ex: /lessons/*.json).
-    out_dir : Path
-        Dossier de sortie pour les pages HTML.
-    lessons_index : dict
-        Index des leçons { lesson_id: meta }. `meta` peut au minimum contenir le titre.
-    global_manifest : dict
-        Manifest global avec la clé 'words' :
-        words: [
+    ctx : BuildContext
+        Contexte de build partagé (voir 17_utils_build_context.py) :
+        - ctx.lessons_index : { lesson_id: meta }, `meta` peut au minimum contenir le titre
+        - ctx.lesson(lid) / ctx.lesson_refs(lid) : définition de la leçon et mots résolus
+          vers les entrées du manifest global :
             {
                 "id": <str>,
                 "pt": <str>,
                 "fr": <str>,
                 "phon": <str>,                 # ← phonétique (clé alignée)
                 "files": { "normal": <str>, "slow": <str> }
-            },
-            ...
-        ]
+            }
+    out_dir : Path
+        Dossier de sortie pour les pages HTML.
+    assets : AssetBundle, optionnel
+        CSS/JS partagés (fichiers à empreinte ou inline) ; sans lui, ils sont recopiés dans chaque page.
+    cache : BuildCache, optionnel
+        Cache de build incrémental : une page dont les entrées n'ont pas changé n'est pas réécrite.
     """
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # Index des mots par ID (source unique)
-    by_id = {w.get("id"): w for w in (global_manifest.get("words") or []) if w.get("id")}
-
-    for lid, meta in (lessons_index or {}).items():
-        # Charger la définition de la leçon
-        lesson_path = root / "lessons" / f"{lid}.json"
-        lesson = load_json(lesson_path)
+    for lid, meta in ctx.lessons_index.items():
+        # Définition de la leçon (chargée une seule fois par build, partagée avec quiz/dictée)
+        lesson = ctx.lesson(lid)
 
         # Titre : priorité à la leçon, puis meta, sinon fallback sur l'id
         title = lesson.get("title") or (meta.get("title") if isinstance(meta, dict) else None) or lid
-        words = lesson.get("words") or []
+        # Entrées du manifest pour chaque référence (None si introuvable)
+        resolved = ctx.lesson_refs(lid)
+
+        # Build incrémental : entrées = id, titre et mots résolus (dans l'ordre, manquants inclus)
+        out_file = out_dir / f"lesson-{lid}.html"
+        if cache is not None and not cache.need(out_file, lid, title, resolved, assets and assets.key()):
+            continue
 
         # Construire les cartes
         cards_html: List[str] = []
-        for idx, ref in enumerate(words, start=1):
-            # Chaque ref devrait ressembler à {"id": "..."} ; on mappe vers l'entrée du manifest
-            word = by_id.get(ref.get("id")) if isinstance(ref, dict) else None
+        for idx, word in enumerate(resolved, start=1):
             if not word:
                 continue
 
@@ -150,15 +155,14 @@ def build_lesson_pages(
             f'  <a class="btn" href="dictation-{lid}.html">⌨️ Dictée</a>'
             f'</div>'
             f'<div class="toolbar">'
-            f'  <input id="search" type="text" placeholder="Rechercher (PT ou FR)..." oninput="filterCards()" />'
+            f'  <input id="search" type="text" placeholder="Rechercher (PT, FR ou phonétique)..." oninput="filterCards()" />'
             f'  <label><input id="quiz" type="checkbox" onchange="toggleQuiz()"> Mode Quiz (cacher FR)</label>'
             f'</div>'
             f'<div id="list" class="grid">{"".join(cards_html)}</div>'
         )
 
         # Écriture du HTML
-        out_file = out_dir / f"lesson-{lid}.html"
-        write_html(out_file, f"Leçon — {title}", f"ID : {lid}", body)
+        write_html(out_file, f"Leçon — {title}", f"ID : {lid}", body, assets=assets)
 
 # -----------------------------
 # Exécution directe (optionnel)
@@ -185,5 +189,5 @@ if __name__ == "__main__":
     lessons_index = json.loads(lessons_index_path.read_text(encoding="utf-8"))
     global_manifest = json.loads(global_manifest_path.read_text(encoding="utf-8"))
 
-    build_lesson_pages(root, out_dir, lessons_index, global_manifest)
+    build_lesson_pages(BuildContext(root, global_manifest, lessons_index), out_dir)
     print(f"✅ Pages leçons générées dans : {out_dir}")
@@ -1,4 +1,100 @@
+import hashlib
 import json
+import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from utils_search_index import fold_text
+from utils_write_html import write_if_changed
+
+HARD_DISTRACTORS = 3      # voisins "difficiles" précalculés par mot (item.hard)
+HARD_CANDIDATES = 24      # candidats (trigrammes communs) départagés par distance d'édition
+HARD_MAX_POSTINGS = 300   # trigrammes trop fréquents ignorés pour la recherche de candidats
+
+_NON_WORD = re.compile(r"[^\w\s]|_")   # comme /[^\p{L}\p{N}\s]/gu côté JS
+
+def answer_forms(text: str):
+    """
+    Formes de référence de la dictée, précalculées pour ne pas renormaliser la réponse attendue dans le
+    navigateur : (minuscules, ponctuation -> espace, espaces réduits ; la même sans accents).
+    Mêmes règles que gradeForm / foldForm (13_assets_dictation_js.py), qui normalisent la saisie.
+    """
+    norm = " ".join(_NON_WORD.sub(" ", unicodedata.normalize("NFC", text or "").lower()).split())
+    return norm, unicodedata.normalize("NFC", fold_text(norm))
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Distance de Levenshtein bornée : seule la bande |i - j| <= limit est calculée,
+    et `limit + 1` est retourné dès que la distance dépasse `limit`.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    la, lb = len(a), len(b)
+    big = limit + 1
+    if la - lb > limit:
+        return big
+    prev = [j if j <= limit else big for j in range(lb + 1)]
+    for i in range(1, la + 1):
+        lo, hi = max(1, i - limit), min(lb, i + limit)
+        cur = [big] * (lb + 1)
+        if i <= limit:
+            cur[0] = i
+        ca = a[i - 1]
+        row_min = cur[0]
+        for j in range(lo, hi + 1):
+            d = prev[j - 1] + (ca != b[j - 1])
+            if prev[j] + 1 < d:
+                d = prev[j] + 1
+            if cur[j - 1] + 1 < d:
+                d = cur[j - 1] + 1
+            cur[j] = d if d < big else big
+            if d < row_min:
+                row_min = d
+        if row_min > limit:
+            return big
+        prev = cur
+    return prev[lb]
+
+@lru_cache(maxsize=1024)   # même POOL pour le quiz et la dictée d'une portée
+def hard_distractors(pts: tuple, k: int = HARD_DISTRACTORS):
+    """
+    Pour chaque texte de `pts`, indices des `k` textes les plus proches à l'orthographe
+    (sans accents ni casse) : candidats partageant des trigrammes, départagés par distance d'édition
+    (au plus la moitié de la longueur du texte : au-delà, le mot n'est plus une "réponse piège").
+    Les textes identiques sont exclus (ils ne peuvent pas servir de mauvaise réponse).
+    """
+    folded = [fold_text(pt) for pt in pts]
+    grams_of = []
+    postings = {}
+    for i, f in enumerate(folded):
+        padded = f" {f} "
+        grams = sorted({padded[j:j + 3] for j in range(len(padded) - 2)})   # ordre stable : sortie reproductible
+        grams_of.append(grams)
+        for g in grams:
+            postings.setdefault(g, []).append(i)
+
+    result = []
+    for i, f in enumerate(folded):
+        shared = Counter()
+        for g in grams_of[i]:
+            ids = postings[g]
+            if len(ids) <= HARD_MAX_POSTINGS:
+                shared.update(ids)
+        shared.pop(i, None)
+        # Candidats les plus prometteurs d'abord : la distance du k-ième retenu borne les calculs suivants
+        ranked = []
+        candidates = [j for j, _ in shared.most_common(HARD_CANDIDATES * 2) if pts[j] != pts[i]]
+        for j in candidates[:HARD_CANDIDATES]:
+            # à distance égale, un candidat suivant (moins de trigrammes communs) est classé après : inutile
+            limit = ranked[-1][0] - 1 if len(ranked) >= k else max(2, len(f) // 2)
+            d = _edit_distance(f, folded[j], limit)
+            if d <= limit:
+                ranked.append((d, -shared[j], j))
+                ranked.sort()
+                del ranked[k:]
+        result.append([j for _, _, j in ranked])
+    return result
 
 def to_quiz_pool_js(words_list):
     """
@@ -9,6 +105,10 @@ def to_quiz_pool_js(words_list):
       - phon (str) : phonétique (même clé que pour les leçons)
       - files.normal (str) : chemin du fichier audio "normal"
 
+    Chaque élément reçoit aussi "hard" : indices (dans le POOL) de ses voisins à l'orthographe,
+    proposés en priorité comme mauvaises réponses par le QCM, et "norm" / "fold" : formes de
+    référence de la dictée (voir answer_forms).
+
     Retourne une chaîne JSON (pour injection côté JS).
     """
     arr = []
@@ -19,11 +119,40 @@ def to_quiz_pool_js(words_list):
             # On ne prend que les entrées avec un audio "normal"
             continue
 
+        norm, fold = answer_forms(w.get("pt", ""))
         arr.append({
+            "id":    w.get("id", ""),     # ← clé de l'état de répétition espacée (27_assets_srs_js.py)
             "pt":    w.get("pt", ""),
             "fr":    w.get("fr", ""),
             "phon":  w.get("phon", ""),   # ← phonétique alignée sur les leçons
-            "normal": normal
+            "normal": normal,
+            "norm":  norm,                # ← réponse attendue de la dictée (avec / sans accents)
+            "fold":  fold,
         })
 
+    for item, hard in zip(arr, hard_distractors(tuple(x["pt"] for x in arr))):
+        item["hard"] = hard
     return json.dumps(arr, ensure_ascii=False)
+
+def write_pool_file(out_dir: Path, scope: str, pool_js_array: str, var_name: str = "POOL") -> str:
+    """
+    Écrit le POOL d'une portée ("_all" ou id de leçon) dans pools/<scope>.<hash>.js, partagé par
+    le quiz et la dictée de cette portée (et mis en cache par le navigateur).
+    `var_name` : variable globale définie par le fichier (ex: WORDS pour la liste de l'accueil).
+    Le nom dépend du contenu : un fichier déjà présent est identique et n'est pas réécrit.
+    Retourne le chemin relatif à utiliser dans <script src>.
+    """
+    pools_dir = out_dir / "pools"
+    content = f"var {var_name} = {pool_js_array};\n"
+    h = hashlib.sha1(content.encode("utf-8")).hexdigest()[:10]
+    name = f"{scope}.{h}.js"
+    path = pools_dir / name
+    if not path.exists():
+        pools_dir.mkdir(parents=True, exist_ok=True)
+        write_if_changed(path, content)
+        # Anciennes versions de cette portée
+        stale = re.compile(rf"{re.escape(scope)}\.[0-9a-f]{{10}}\.js")
+        for old in pools_dir.glob(f"{scope}.*.js"):
+            if old.name != name and stale.fullmatch(old.name):
+                old.unlink()
+    return f"pools/{name}"
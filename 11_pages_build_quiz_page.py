@@ -1,7 +1,9 @@
 from pathlib import Path
 from utils_write_html import write_html
 
-def build_quiz_page(out_path: Path, title: str, subtitle: str, pool_js_array: str, quiz_js: str, timer_seconds: int):
+SCRIPTS = ("srs", "results", "quiz")   # assets chargés par la page (clé du cache de build : assets.key(*SCRIPTS))
+
+def build_quiz_page(out_path: Path, title: str, subtitle: str, pool_js_array: str, assets, timer_seconds: int, pool_src: str = "", sprite_src: str = ""):
     body = f"""    <div class="quiz-wrap">
       <div id="config" class="quiz-card">
         <div class="pt">Paramètres du quiz</div>
@@ -34,5 +36,14 @@ def build_quiz_page(out_path: Path, title: str, subtitle: str, pool_js_array: st
       </div>
     </div>
     """
-    extra_js = f"const POOL = {pool_js_array};\n" + quiz_js + "\nstartQuiz(POOL);"
-    write_html(out_path, title, subtitle, body, extra_js)
+    # Le moteur (quiz.<hash>.js, avec srs et results.<hash>.js) est chargé avant ce script.
+    # Avec `pool_src`, les données viennent du fichier partagé pools/<scope>.<hash>.js (qui définit POOL).
+    # Avec `sprite_src`, les clips sont lus dans le sprite MP3 de la portée (SPRITES), fichiers individuels sinon.
+    if pool_src:
+        extra_js = "startQuiz(POOL);"
+    else:
+        extra_js = f"const POOL = {pool_js_array};\nstartQuiz(POOL);"
+    if sprite_src:
+        extra_js = "registerSprites(SPRITES);\n" + extra_js
+    write_html(out_path, title, subtitle, body, extra_js, assets=assets, scripts=SCRIPTS,
+               script_srcs=tuple(src for src in (pool_src, sprite_src) if src))
@@ -1,22 +1,32 @@
 from pathlib import Path
-from utils_load_json import load_json
-from pages_to_quiz_pool_js import to_quiz_pool_js
-from pages_build_quiz_page import build_quiz_page
+from pages_to_quiz_pool_js import to_quiz_pool_js, write_pool_file
+from utils_audio_sprites import sprite_files, write_sprites
+from pages_build_quiz_page import SCRIPTS, build_quiz_page
 
-def build_quiz_pages(root: Path, out_dir: Path, lessons_index: dict, global_manifest: dict, quiz_js: str, timer_seconds: int = 8):
+def build_quiz_pages(ctx, out_dir: Path, assets, timer_seconds: int = 8, cache=None, include_global=True,
+                  sprites: str = "lessons"):
     # global quiz
-    all_words = global_manifest.get("words", [])
-    pool_js = to_quiz_pool_js(all_words)
-    build_quiz_page(out_dir / "quiz.html", "Quiz — Tous les mots", "Clique sur la bonne réponse après écoute.", pool_js, quiz_js, timer_seconds)
+    out_path = out_dir / "quiz.html"
+    if include_global and (cache is None or cache.need(out_path, ctx.words_key, assets.key(*SCRIPTS), timer_seconds, sprites)):
+        pool_js = to_quiz_pool_js(ctx.iter_words())
+        # Un fichier de données par portée, commun au quiz et à la dictée (sauf mode inline)
+        pool_src = "" if assets.inline else write_pool_file(out_dir, "_all", pool_js)
+        # Sprites du vocabulaire global (par paquets) : seulement si demandé, un quiz global n'en joue qu'une partie
+        sprite_src = write_sprites(out_dir, ctx.root, "_all", ctx.iter_words()) if pool_src and sprites == "all" else ""
+        build_quiz_page(out_path, "Quiz — Tous les mots", "Clique sur la bonne réponse après écoute.", pool_js, assets, timer_seconds, pool_src, sprite_src)
+        if cache is not None:
+            cache.produced(out_path, pool_src, *sprite_files(sprite_src))
 
     # per-lesson
-    by_id = {w.get("id"): w for w in all_words if w.get("id")}
-    for lid, _ in lessons_index.items():
-        lesson = load_json(root / "lessons" / f"{lid}.json")
-        title = lesson.get("title", lid)
-        words = []
-        for ref in lesson.get("words", []):
-            w = by_id.get(ref.get("id"))
-            if w: words.append(w)
+    for lid in ctx.lesson_ids:
+        title = ctx.lesson(lid).get("title", lid)
+        words = ctx.lesson_words(lid)
+        out_path = out_dir / f"quiz-{lid}.html"
+        if cache is not None and not cache.need(out_path, lid, title, words, assets.key(*SCRIPTS), timer_seconds, sprites):
+            continue
         pool_js = to_quiz_pool_js(words)
-        build_quiz_page(out_dir / f"quiz-{lid}.html", f"Quiz — {title}", f"Leçon : {lid}", pool_js, quiz_js, timer_seconds)
+        pool_src = "" if assets.inline else write_pool_file(out_dir, lid, pool_js)
+        sprite_src = write_sprites(out_dir, ctx.root, lid, words) if pool_src and sprites in ("lessons", "all") else ""
+        build_quiz_page(out_path, f"Quiz — {title}", f"Leçon : {lid}", pool_js, assets, timer_seconds, pool_src, sprite_src)
+        if cache is not None:
+            cache.produced(out_path, pool_src, *sprite_files(sprite_src))
@@ -1,23 +1,107 @@
 # 13_assets_dictation_js.py
 # Quiz "dictée": l'utilisateur saisit le texte entendu, correction + feedback + récap
+# Ordre des items : répétition espacée (Scheduler, 27_assets_srs_js.py), mots dus d'abord
+# Partie terminée enregistrée pour stats.html (saveResults, 28_assets_results_js.py)
+# Mesures par item dans history (QuestionTimer, 03_assets_base_js_common.py) ; export JSON depuis le récap
+# Correction tolérante (GRADING_JS) : exact, juste aux accents près, quelques fautes de frappe
+# (Damerau-Levenshtein bornée), ou faux ; diff caractère par caractère dans le feedback.
+# Formes attendues (item.norm / item.fold) précalculées au build (answer_forms, 10_pages_to_quiz_pool_js.py).
 
-def make_dictation_js(timer_seconds: int = 12, reveal_delay_ms: int = 1500) -> str:
+GRADING_JS = """// Saisie comparable : minuscules, ponctuation -> espace, espaces réduits (accents conservés)
+function gradeForm(s){
+  return String(s || '').normalize('NFC').toLowerCase().replace(/[^\\p{L}\\p{N}\\s]/gu, ' ').replace(/\\s+/g, ' ').trim();
+}
+function foldForm(s){ return s.normalize('NFD').replace(/[\\u0300-\\u036f]/g, '').normalize('NFC'); }
+
+// Distance de Damerau-Levenshtein (transpositions adjacentes) bornée : k + 1 dès qu'elle dépasse k.
+// Seule la bande |i - j| <= k est calculée : O(n·k).
+function boundedDistance(a, b, k){
+  const n = a.length, m = b.length, INF = k + 1;
+  if (Math.abs(n - m) > k) return INF;
+  let pp = new Int32Array(m + 2), prev = new Int32Array(m + 2), cur = new Int32Array(m + 2);
+  for (let j = 0; j <= m + 1; j++) prev[j] = j <= k ? j : INF;
+  for (let i = 1; i <= n; i++){
+    const lo = Math.max(1, i - k), hi = Math.min(m, i + k);
+    cur[lo - 1] = lo === 1 ? Math.min(i, INF) : INF;
+    let best = cur[lo - 1];
+    for (let j = lo; j <= hi; j++){
+      let d = Math.min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (a[i - 1] === b[j - 1] ? 0 : 1));
+      if (i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) d = Math.min(d, pp[j - 2] + 1);
+      cur[j] = d < INF ? d : INF;
+      if (d < best) best = d;
+    }
+    if (hi < m) cur[hi + 1] = INF;
+    if (best > k) return INF;
+    [pp, prev, cur] = [prev, cur, pp];
+  }
+  return Math.min(prev[m], INF);
+}
+
+// Note d'une saisie pour l'item `cur` : { grade: 'exact' | 'accents' | 'typo' | 'wrong', points, dist }
+// `known` : formes sans accents de tous les mots du POOL ; une saisie qui en est un autre n'est jamais une faute
+// de frappe ("sem" pour "sim"). Pas de tolérance sous DICT_TYPO_MIN_LETTERS lettres.
+function gradeAnswer(user, cur, known){
+  const ref = cur.norm !== undefined ? cur.norm : gradeForm(cur.pt);
+  const refFold = cur.fold !== undefined ? cur.fold : foldForm(ref);
+  const u = gradeForm(user);
+  if (u === ref) return { grade: 'exact', points: 1, dist: 0, form: u, ref };
+  if (!u) return { grade: 'wrong', points: 0, dist: null, form: u, ref };
+  const uf = foldForm(u);
+  if (uf === refFold) return { grade: 'accents', points: DICT_ACCENT_POINTS, dist: 0, form: u, ref };
+  if (known && known.has(uf)) return { grade: 'wrong', points: 0, dist: null, form: u, ref, other: true };
+  const k = refFold.replace(/ /g, '').length >= DICT_TYPO_MIN_LETTERS ? Math.floor(refFold.length * DICT_TYPOS) : 0;
+  const d = k ? boundedDistance(uf, refFold, k) : k + 1;
+  return d <= k ? { grade: 'typo', points: DICT_TYPO_POINTS, dist: d, form: u, ref }
+                : { grade: 'wrong', points: 0, dist: null, form: u, ref };
+}
+
+// Alignement saisie -> attendu pour le feedback (textes courts : table complète)
+// ['=', c] identique, ['~', attendu, saisi] remplacé, ['+', attendu] manquant, ['-', saisi] en trop
+function charDiff(u, ref){
+  const n = u.length, m = ref.length, D = [];
+  for (let i = 0; i <= n; i++){ D.push(new Int32Array(m + 1)); D[i][0] = i; }
+  for (let j = 0; j <= m; j++) D[0][j] = j;
+  for (let i = 1; i <= n; i++) for (let j = 1; j <= m; j++)
+    D[i][j] = Math.min(D[i - 1][j] + 1, D[i][j - 1] + 1, D[i - 1][j - 1] + (u[i - 1] === ref[j - 1] ? 0 : 1));
+  const ops = [];
+  for (let i = n, j = m; i > 0 || j > 0;){
+    if (i > 0 && j > 0 && D[i][j] === D[i - 1][j - 1] + (u[i - 1] === ref[j - 1] ? 0 : 1)){
+      ops.push(u[i - 1] === ref[j - 1] ? ['=', ref[j - 1]] : ['~', ref[j - 1], u[i - 1]]); i--; j--;
+    } else if (j > 0 && D[i][j] === D[i][j - 1] + 1){ ops.push(['+', ref[j - 1]]); j--; }
+    else { ops.push(['-', u[i - 1]]); i--; }
+  }
+  return ops.reverse();
+}
+// Formes normalisées : lettres, chiffres et espaces seulement, rien à échapper
+function diffHtml(ops){
+  const vis = c => c === ' ' ? '␣' : c;
+  return '<span class="diff">' + ops.map(([op, c, typed]) =>
+    op === '=' ? c
+    : op === '~' ? `<span class="${foldForm(c) === foldForm(typed) ? 'd-acc' : 'd-sub'}" title="saisi : ${typed}">${c}</span>`
+    : op === '+' ? `<span class="d-miss">${vis(c)}</span>`
+    : `<del class="d-extra">${vis(c)}</del>`).join('') + '</span>';
+}
+function fmtScore(x){ return String(Math.round(x * 100) / 100); }
+"""
+
+def make_dictation_js(timer_seconds: int = 12, reveal_delay_ms: int = 1500, typo_tolerance: float = 0.2,
+                      accent_points: float = 0.75, typo_points: float = 0.5, typo_min_letters: int = 5) -> str:
+    """
+    `typo_tolerance` : distance tolérée, en fraction de la longueur attendue (arrondie vers le bas ; 0 = exact ou accents).
+    `typo_min_letters` : réponses plus courtes : aucune faute de frappe tolérée (seulement les accents).
+    `accent_points` / `typo_points` : points d'une réponse juste aux accents près / à quelques fautes près.
+    """
     return (
-        "function normalize(s){\n"
-        "  if(!s) return '';\n"
-        "  return s\n"
-        "    .normalize('NFD')\n"
-        "    .replace(/[\\u0300-\\u036f]/g,'')    // accents\n"
-        "    .replace(/[^\\w\\s]/g,' ')           // ponctuation -> espace\n"
-        "    .replace(/\\s+/g,' ')                // espaces multiples\n"
-        "    .trim()\n"
-        "    .toLowerCase();\n"
-        "}\n"
+        "const DICT_TYPOS = " + repr(float(typo_tolerance)) + ";\n"
+        "const DICT_TYPO_MIN_LETTERS = " + str(int(typo_min_letters)) + ";\n"
+        "const DICT_ACCENT_POINTS = " + repr(float(accent_points)) + ";\n"
+        "const DICT_TYPO_POINTS = " + repr(float(typo_points)) + ";\n"
+        + GRADING_JS +
         "function DictationApp(config){\n"
         "  const TIMER_LIMIT_S = " + str(timer_seconds) + ";\n"
         "  const REVEAL_DELAY_MS = " + str(reveal_delay_ms) + ";\n"
-        "  const state={ pool:config.pool, idx:0, score:0, total:config.total, started:false, paused:false,\n"
-        "                countdown:TIMER_LIMIT_S, countdownInterval:null, answered:false, history:[] };\n"
+        "  const state={ source:config.pool, order:[], pool:config.pool, idx:0, score:0, total:config.total, started:false, paused:false,\n"
+        "                countdown:TIMER_LIMIT_S, countdownInterval:null, answered:false, history:[], srs:null, timer:null, known:null };\n"
         "  const elBtnStart=document.getElementById('btn-start');\n"
         "  const elBtnCheck=document.getElementById('btn-check');\n"
         "  const elBtnNext=document.getElementById('btn-next');\n"
@@ -50,19 +134,21 @@ def make_dictation_js(timer_seconds: int = 12, reveal_delay_ms: int = 1500) -> s
         "  function render(){\n"
         "    const cur=state.pool[state.idx];\n"
         "    state.answered=false; elInput.disabled=false; elInput.value=''; elInput.focus();\n"
-        "    elResult.innerHTML=''; elQ.textContent=(state.idx+1)+' / '+state.total; elScore.textContent=state.score;\n"
-        "    stopAudio(); play(cur.normal); startCountdown(); setButtons();\n"
+        "    elResult.innerHTML=''; elQ.textContent=(state.idx+1)+' / '+state.total; elScore.textContent=fmtScore(state.score);\n"
+        "    stopAudio(); play(cur.normal, state.timer.shown()); startCountdown(); setButtons();\n"
+        "    prefetchAudio(state.pool.slice(state.idx+1, state.idx+1+AUDIO_PREFETCH).map(x=>x.normal));   // items suivants prêts à jouer\n"
         "  }\n"
-        "  function showFeedback(cur, isCorrect, userText){\n"
+        "  const GRADE_TITLES = { exact:'✅ Correct !', accents:'🟡 Presque : accents à revoir.', typo:'🟡 Presque : faute de frappe.', wrong:'❌ Mauvaise réponse.' };\n"
+        "  function showFeedback(cur, g, userText){\n"
         "    const fr = (cur.fr||''); const phon = (cur.phon||'');\n"
-        "    const icon = isCorrect ? '✅' : '❌';\n"
-        "    const title = isCorrect ? 'Correct !' : 'Mauvaise réponse.';\n"
+        "    const diff = (g.grade!=='exact' && g.form) ? `<div class=\"fb-diff\"><strong>Correction :</strong> ${diffHtml(charDiff(g.form, g.ref))}</div>` : '';\n"
         "    elResult.innerHTML = `<div class=\"feedback\">\n"
-        "      <div class=\"fb-title\">${icon} ${title}</div>\n"
+        "      <div class=\"fb-title\">${g.other ? '❌ Mauvaise réponse : c’est un autre mot.' : GRADE_TITLES[g.grade]}${g.points&&g.points<1 ? ' (+'+fmtScore(g.points)+')' : ''}</div>\n"
         "      <div class=\"fb-pt\"><strong>Attendu (PT) :</strong> ${cur.pt||''}</div>\n"
         "      <div class=\"fb-phon\"><strong>Phonétique :</strong> ${phon||'—'}</div>\n"
         "      <div class=\"fb-fr\"><strong>Français :</strong> ${fr||'—'}</div>\n"
         "      <div class=\"fb-user small\"><strong>Votre saisie :</strong> ${userText?userText:'(vide)'} </div>\n"
+        "      ${diff}\n"
         "    </div>`;\n"
         "  }\n"
         "  function check(){\n"
@@ -70,31 +156,44 @@ def make_dictation_js(timer_seconds: int = 12, reveal_delay_ms: int = 1500) -> s
         "    state.answered=true; clearInterval(state.countdownInterval);\n"
         "    const cur=state.pool[state.idx];\n"
         "    const user=elInput.value||''; elInput.disabled=true;\n"
-        "    const ok = normalize(user)===normalize(cur.pt||'');\n"
-        "    if(ok) state.score+=1; elScore.textContent=state.score;\n"
-        "    showFeedback(cur, ok, user);\n"
-        "    state.history.push({pt:cur.pt||'', phon:cur.phon||'', fr:cur.fr||'', user:user, correct:ok});\n"
+        "    const g = gradeAnswer(user, cur, state.known);\n"
+        "    state.score+=g.points; elScore.textContent=fmtScore(state.score);\n"
+        "    showFeedback(cur, g, user);\n"
+        "    record(cur, user, g, false);\n"
         "    setButtons();\n"
         "    setTimeout(()=>{ /* auto-next visuelle mais on garde le bouton */ }, REVEAL_DELAY_MS);\n"
         "  }\n"
         "  function onTimeout(){\n"
         "    if(state.answered) return; state.answered=true; elInput.disabled=true;\n"
         "    const cur=state.pool[state.idx];\n"
-        "    showFeedback(cur, false, elInput.value||'');\n"
-        "    state.history.push({pt:cur.pt||'', phon:cur.phon||'', fr:cur.fr||'', user:elInput.value||'', correct:false});\n"
+        "    const g = { grade:'wrong', points:0, dist:null, form:gradeForm(elInput.value), ref:cur.norm!==undefined ? cur.norm : gradeForm(cur.pt) };\n"
+        "    showFeedback(cur, g, elInput.value||'');\n"
+        "    record(cur, elInput.value||'', g, true);\n"
         "    setButtons();\n"
         "  }\n"
+        "  // Réponse enregistrée dans history, qui alimente la répétition espacée\n"
+        "  function record(cur, user, g, timeout){\n"
+        "    const e=Object.assign({id:cur.id||'', pt:cur.pt||'', phon:cur.phon||'', fr:cur.fr||'', user, correct:g.grade!=='wrong',\n"
+        "             grade:g.grade, points:g.points, dist:g.dist,\n"
+        "             limitMs:TIMER_LIMIT_S*1000}, state.timer.answer(timeout));\n"
+        "    state.history.push(e);\n"
+        "    state.srs.review(state.order[state.idx], srsQuality(e));\n"
+        "  }\n"
         "  function next(){\n"
         "    if(state.idx+1>=state.total){\n"
         "      // Summary\n"
         "      const rows = state.history.map((e,i)=>{\n"
-        "        const st = e.correct?'✅':'❌';\n"
-        "        return `<tr class=\"row-${e.correct?'ok':'ko'}\"><td>${i+1}</td><td>${st}</td><td>${e.pt}</td><td>${e.phon||'—'}</td><td>${e.fr||'—'}</td><td>${e.user||''}</td></tr>`;\n"
+        "        const st = e.grade==='exact'?'✅':e.correct?'🟡':'❌';\n"
+        "        return `<tr class=\"row-${e.correct?'ok':'ko'}\"><td>${i+1}</td><td>${st}</td><td>${e.pt}</td><td>${e.phon||'—'}</td><td>${e.fr||'—'}</td><td>${e.user||''}</td><td>${e.timeout?'⏱️':(e.ms/1000).toFixed(1)+' s'}</td></tr>`;\n"
         "      }).join('');\n"
+        "      endSession('dictation', state.history, TIMER_LIMIT_S*1000);\n"
         "      elResult.innerHTML = `<div class=\"summary\">\n"
-        "        <div class=\"summary-title\">🎉 Terminé ! Score : ${state.score} / ${state.total}</div>\n"
-        "        <table class=\"summary-table\"><thead><tr><th>#</th><th>OK</th><th>Portugais</th><th>Phonétique</th><th>Français</th><th>Votre saisie</th></tr></thead><tbody>${rows}</tbody></table>\n"
+        "        <div class=\"summary-title\">🎉 Terminé ! Score : ${fmtScore(state.score)} / ${state.total}</div>\n"
+        "        <div class=\"small\">${audioStatsText()}</div>\n"
+        "        <div class=\"small\">${timingStatsText(state.history)}</div>\n"
+        "        <table class=\"summary-table\"><thead><tr><th>#</th><th>OK</th><th>Portugais</th><th>Phonétique</th><th>Français</th><th>Votre saisie</th><th>Temps</th></tr></thead><tbody>${rows}</tbody></table>\n"
         "      </div>`;\n"
+        "      saveResults('dictation', state.history, location.pathname.split('/').pop());\n"
         "      elBtnCheck.style.display='none'; elBtnNext.style.display='none';\n"
         "      return;\n"
         "    }\n"
@@ -103,12 +202,17 @@ def make_dictation_js(timer_seconds: int = 12, reveal_delay_ms: int = 1500) -> s
         "\n"
         "  // Wire UI\n"
         "  elBtnStart.onclick=()=>{\n"
-        "    state.started=true; state.score=0; state.idx=0; state.history=[]; elConfig.style.display='none'; elStage.style.display='block';\n"
+        "    if(!state.srs) state.srs=Scheduler(state.source);\n"
+        "    if(!state.known) state.known=new Set(state.source.map(x=>x.fold!==undefined ? x.fold : foldForm(gradeForm(x.pt))));\n"
+        "    state.srs.release(state.order);   // items tirés mais sans réponse (partie précédente)\n"
+        "    state.order=state.srs.take(config.total); state.pool=state.order.map(i=>state.source[i]); state.total=state.pool.length;\n"
+        "    state.started=true; state.score=0; state.idx=0; state.history=[]; state.timer=QuestionTimer('dictation'); elConfig.style.display='none'; elStage.style.display='block';\n"
         "    render();\n"
         "  };\n"
+        "  elInput.addEventListener('input', ()=>{ if(state.timer && !state.answered) state.timer.input(); });   // première saisie\n"
         "  elBtnCheck.onclick=check;\n"
         "  elBtnNext.onclick=next;\n"
-        "  elBtnRestart.onclick=()=>{ clearInterval(state.countdownInterval); state.started=false; elStage.style.display='none'; elConfig.style.display='block'; setButtons(); };\n"
+        "  elBtnRestart.onclick=()=>{ clearInterval(state.countdownInterval); if(state.srs) state.srs.release(state.order); state.started=false; elStage.style.display='none'; elConfig.style.display='block'; setButtons(); };\n"
         "  setButtons();\n"
         "}\n"
         "function startDictationQuiz(POOL){ DictationApp({ pool: POOL, total: POOL.length }); }\n"
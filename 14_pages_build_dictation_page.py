@@ -2,14 +2,16 @@
 from pathlib import Path
 from utils_write_html import write_html
 
-def build_dictation_page(out_path: Path, title: str, subtitle: str, pool_js_array: str, dictation_js: str, timer_seconds: int):
+SCRIPTS = ("srs", "results", "dictation")   # assets chargés par la page (clé du cache de build : assets.key(*SCRIPTS))
+
+def build_dictation_page(out_path: Path, title: str, subtitle: str, pool_js_array: str, assets, timer_seconds: int, pool_src: str = "", sprite_src: str = ""):
     body = f"""    <div class="quiz-wrap">
       <div id="config" class="quiz-card">
         <div class="pt">Paramètres dictée</div>
         <div class="row">
           <button id="btn-start">▶️ Démarrer</button>
         </div>
-        <div class="small">Écoute l’audio puis <b>saisis exactement</b> ce que tu entends.</div>
+        <div class="small">Écoute l’audio puis <b>saisis</b> ce que tu entends. Réponse juste aux accents près ou avec une petite faute de frappe (mots assez longs) : points partiels.</div>
       </div>
 
       <div id="stage" class="quiz-card" style="display:none">
@@ -28,5 +30,14 @@ def build_dictation_page(out_path: Path, title: str, subtitle: str, pool_js_arra
       </div>
     </div>
     """
-    extra_js = f"const POOL = {pool_js_array};\n" + dictation_js + "\nstartDictationQuiz(POOL);"
-    write_html(out_path, title, subtitle, body, extra_js)
+    # Le moteur (dictation.<hash>.js, avec srs et results.<hash>.js) est chargé avant ce script.
+    # Avec `pool_src`, les données viennent du fichier partagé pools/<scope>.<hash>.js (qui définit POOL).
+    # Avec `sprite_src`, les clips sont lus dans le sprite MP3 de la portée (SPRITES), fichiers individuels sinon.
+    if pool_src:
+        extra_js = "startDictationQuiz(POOL);"
+    else:
+        extra_js = f"const POOL = {pool_js_array};\nstartDictationQuiz(POOL);"
+    if sprite_src:
+        extra_js = "registerSprites(SPRITES);\n" + extra_js
+    write_html(out_path, title, subtitle, body, extra_js, assets=assets, scripts=SCRIPTS,
+               script_srcs=tuple(src for src in (pool_src, sprite_src) if src))
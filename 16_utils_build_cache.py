@@ -0,0 +1,95 @@
+# 16_utils_build_cache.py
+# Build incrémental : chaque fichier produit mémorise l'empreinte (sha1) de ses entrées
+# dans un fichier cache ; seuls les fichiers dont les entrées ont changé sont régénérés.
+# Les fichiers annexes écrits avec une page (pools, sprites...) sont mémorisés avec elle : s'ils ont
+# disparu, la page est régénérée (et eux avec).
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+CACHE_VERSION = 2   # 2 : fichiers annexes ("files")
+
+def hash_inputs(*parts) -> str:
+    """Empreinte stable d'un ensemble d'entrées sérialisables en JSON (dict, list, str, int...)."""
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(json.dumps(part, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+class BuildCache:
+    """
+    Graphe de build minimal : { fichier produit -> empreinte de ses entrées }
+    (+ { fichier produit -> fichiers annexes, relatifs au dossier du cache }).
+    - `salt` : empreinte commune à toutes les sorties (sources du générateur, CSS/JS de base...)
+    - `force`: ignore le cache existant (tout est reconstruit)
+    """
+    def __init__(self, path: Path, salt: str = "", force: bool = False):
+        self.path = path
+        self.salt = salt
+        self.old, self.old_files = ({}, {}) if force else self._read(path)
+        self.new = {}
+        self.files = {}
+        self.built = []
+        self.skipped = []
+        self.started = time.perf_counter()
+
+    @staticmethod
+    def _read(path: Path) -> tuple:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("version") != CACHE_VERSION:
+                return {}, {}
+            return data.get("outputs", {}), data.get("files", {})
+        except (OSError, ValueError, AttributeError):
+            return {}, {}
+
+    def need(self, out_path: Path, *inputs) -> bool:
+        """
+        True si `out_path` doit être (re)généré pour ces entrées, ou si l'un de ses fichiers annexes
+        (voir produced) a disparu ; la décision est enregistrée.
+        """
+        name = out_path.name
+        key = hash_inputs(self.salt, *inputs)
+        self.new[name] = key
+        files = self.old_files.get(name, [])
+        if (self.old.get(name) == key and out_path.exists()
+                and all((self.path.parent / f).exists() for f in files)):
+            if files:
+                self.files[name] = files
+            self.skipped.append(name)
+            return False
+        self.built.append(name)
+        return True
+
+    def produced(self, out_path: Path, *files: str):
+        """Fichiers annexes (chemins relatifs au dossier du cache) écrits avec `out_path`, exigés par need()."""
+        known = self.files.get(out_path.name, [])
+        added = [f for f in dict.fromkeys(files) if f and f not in known]
+        if added:
+            self.files[out_path.name] = known + added
+
+    def merge(self, new: dict, built: list, skipped: list, files: dict = None):
+        """Intègre les décisions d'un autre BuildCache (ex: celui d'un processus fils)."""
+        self.new.update(new)
+        self.files.update(files or {})
+        self.built.extend(built)
+        self.skipped.extend(skipped)
+
+    def save(self):
+        # Les sorties non visitées pendant ce build disparaissent du cache
+        data = {"version": CACHE_VERSION, "outputs": dict(sorted(self.new.items())),
+                "files": dict(sorted(self.files.items()))}
+        self.path.write_text(json.dumps(data, indent=1), encoding="utf-8")
+
+    def report(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        kinds = {}
+        for name in self.built:
+            kind = name.split("-", 1)[0].split(".", 1)[0]
+            kinds[kind] = kinds.get(kind, 0) + 1
+        detail = ", ".join(f"{k}: {n}" for k, n in sorted(kinds.items()))
+        return (f"🧱 Build : {len(self.built)} généré(s), {len(self.skipped)} inchangé(s) ignoré(s)"
+                f" en {elapsed:.2f}s" + (f" ({detail})" if detail else ""))
@@ -0,0 +1,103 @@
+# 17_utils_build_context.py
+# Contexte de build "résolu" : construit une seule fois dans 01_main.py et partagé par tous les générateurs.
+# - manifeste global lu en flux (utils_load_json.Manifest, formats v2 et v3) : seuls les mots cités par
+#   les leçons sont indexés par id ; les pages globales relisent le manifeste via iter_words()
+# - ou catalogue SQLite (utils_catalog.Catalog) : mots lus par requête indexée, leçons lues dans le catalogue
+# - leçons chargées à la demande, mots déjà résolus, gardées dans un cache LRU borné
+
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from utils_load_json import Manifest
+
+class BuildContext:
+    def __init__(self, root: Path, global_manifest: Union[Manifest, dict, "Catalog"], lessons_index: dict, max_lessons: int = 512):
+        self.root = root
+        if isinstance(global_manifest, dict):
+            global_manifest = Manifest(document=global_manifest)
+        self.manifest = global_manifest
+        self.lessons_index = lessons_index or {}
+        self.word_count = global_manifest.count
+        self.words_key = global_manifest.fingerprint()   # clé de cache des pages globales
+        wanted = self._referenced_ids()
+        # Catalogue : accès par id (get_words) ; manifeste : un parcours
+        self._indexed = hasattr(global_manifest, "get_words")
+        if self._indexed:
+            self.by_id: Dict[str, dict] = global_manifest.get_words(wanted) if wanted is not None else {}
+        else:
+            self.by_id = {w.get("id"): w for w in global_manifest
+                          if w.get("id") and (wanted is None or w.get("id") in wanted)}
+        self._complete = wanted is None or self._indexed   # le catalogue est interrogé leçon par leçon (_resolved)
+        self.max_lessons = max(1, max_lessons)
+        self._lessons: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def _referenced_ids(self) -> Optional[Set[str]]:
+        """Ids cités par _index.json (None si une leçon n'y liste pas ses mots : tout indexer)."""
+        ids = set()
+        for meta in self.lessons_index.values():
+            refs = meta.get("words") if isinstance(meta, dict) else None
+            if not isinstance(refs, list):
+                return None
+            ids.update(ref.get("id") for ref in refs if isinstance(ref, dict))
+        return ids
+
+    def iter_words(self) -> Iterator[dict]:
+        """Mots du manifeste dans l'ordre, relus à chaque appel (jamais tous en mémoire pour la v3)."""
+        return iter(self.manifest)
+
+    @property
+    def lesson_ids(self) -> List[str]:
+        return list(self.lessons_index)
+
+    def subset(self, lesson_ids: Iterable[str]) -> "BuildContext":
+        """Même manifeste (partagé, pas de copie), restreint à quelques leçons."""
+        sub = BuildContext.__new__(BuildContext)
+        sub.__dict__.update(self.__dict__)
+        sub.lessons_index = {lid: self.lessons_index[lid] for lid in lesson_ids}
+        sub._lessons = OrderedDict()
+        return sub
+
+    def _lookup(self, wid: Optional[str]) -> Optional[dict]:
+        w = self.by_id.get(wid)
+        if w is None and wid and not self._complete:
+            # Leçon modifiée sans mise à jour de _index.json : index complet, une seule fois
+            self.by_id.update((x.get("id"), x) for x in self.manifest if x.get("id") and x.get("id") not in self.by_id)
+            self._complete = True
+            w = self.by_id.get(wid)
+        return w
+
+    def _resolved(self, lid: str) -> tuple:
+        hit = self._lessons.get(lid)
+        if hit is not None:
+            self._lessons.move_to_end(lid)
+            return hit
+        if self._indexed:
+            lesson = self.manifest.lesson(lid)
+            ids = [ref.get("id") for ref in (lesson.get("words") or []) if isinstance(ref, dict)]
+            missing = [i for i in ids if i and i not in self.by_id]
+            if missing:
+                self.by_id.update(self.manifest.get_words(missing))
+        else:
+            lesson = json.loads((self.root / "lessons" / f"{lid}.json").read_text(encoding="utf-8"))
+        # Une entrée par référence (None si introuvable) : la numérotation des cartes reste celle de la leçon
+        refs = [self._lookup(ref.get("id")) if isinstance(ref, dict) else None
+                for ref in (lesson.get("words") or [])]
+        hit = (lesson, refs)
+        self._lessons[lid] = hit
+        if len(self._lessons) > self.max_lessons:
+            self._lessons.popitem(last=False)
+        return hit
+
+    def lesson(self, lid: str) -> dict:
+        """Définition brute de la leçon (lessons/<lid>.json, ou sa ligne du catalogue)."""
+        return self._resolved(lid)[0]
+
+    def lesson_refs(self, lid: str) -> List[Optional[dict]]:
+        """Entrées du manifeste pour chaque référence de la leçon, None si introuvable."""
+        return self._resolved(lid)[1]
+
+    def lesson_words(self, lid: str) -> List[dict]:
+        """Entrées du manifeste de la leçon, références introuvables ignorées."""
+        return [w for w in self._resolved(lid)[1] if w]
@@ -0,0 +1,61 @@
+# 18_assets_pipeline.py
+# CSS/JS communs à toutes les pages, écrits une seule fois sous un nom à empreinte :
+#   base.<hash>.css, common.<hash>.js, quiz.<hash>.js, dictation.<hash>.js
+# Le navigateur les garde en cache d'une page à l'autre ; un contenu modifié change de nom (cache-busting).
+# Mode "inline" (optionnel) : tout est recopié dans chaque page, pour un fichier HTML autonome.
+# Mode "minify" (build de production) : CSS/JS minifiés (25_utils_minify.py) avant calcul de l'empreinte.
+
+import hashlib
+import re
+from html import escape
+from pathlib import Path
+
+from utils_write_html import write_if_changed
+from utils_minify import minify_css, minify_js
+
+class AssetBundle:
+    def __init__(self, inline: bool = False, minify: bool = False):
+        self.inline = inline
+        self.minify = minify
+        self.assets = {}   # nom -> (extension, contenu)
+
+    def add(self, name: str, ext: str, content: str):
+        if self.minify:
+            content = minify_css(content) if ext == "css" else minify_js(content)
+        self.assets[name] = (ext, content)
+
+    def filename(self, name: str) -> str:
+        ext, content = self.assets[name]
+        h = hashlib.sha1(content.encode("utf-8")).hexdigest()[:10]
+        return f"{name}.{h}.{ext}"
+
+    def key(self, *scripts) -> dict:
+        """
+        Ce qui, dans les assets chargés par une page ("base", "common" et `scripts`), influence son HTML
+        (pour le cache de build) : modifier un autre asset ne régénère pas la page.
+        """
+        return {"inline": self.inline, "files": {n: self.filename(n) for n in ("base", "common", *scripts)}}
+
+    def write(self, out_dir: Path, cache=None):
+        """Écrit les fichiers d'assets (mode fichiers) et supprime les anciennes versions (toutes en mode inline)."""
+        for name, (ext, content) in self.assets.items():
+            current = None if self.inline else self.filename(name)
+            if current is not None:
+                path = out_dir / current
+                if cache is None or cache.need(path, content):
+                    write_if_changed(path, content)
+            stale = re.compile(rf"{re.escape(name)}\.[0-9a-f]{{10}}\.{re.escape(ext)}")
+            for old in out_dir.glob(f"{name}.*.{ext}"):
+                if old.name != current and stale.fullmatch(old.name):
+                    old.unlink()
+
+    def tag(self, name: str) -> str:
+        """Balise <style>/<link> ou <script> pour l'asset `name`."""
+        ext, content = self.assets[name]
+        if ext == "css":
+            if self.inline:
+                return f"<style>{content}</style>"
+            return f'<link rel="stylesheet" href="{escape(self.filename(name))}" />'
+        if self.inline:
+            return f"<script>{content}</script>"
+        return f'<script src="{escape(self.filename(name))}"></script>'
@@ -0,0 +1,115 @@
+# 19_assets_word_list_js.py
+# Liste "Tous les mots" de l'accueil, rendue côté navigateur avec défilement virtualisé :
+# seules les rangées visibles (+ une marge) existent dans le DOM, quelle que soit la taille du vocabulaire.
+# - Rangées de hauteur variable (textes complets) : hauteur mesurée à l'affichage et gardée en cache,
+#   estimée (moyenne des premières rangées mesurées) pour celles pas encore affichées ; positions = sommes
+#   cumulées, recalculées quand une mesure change. Cache vidé si la largeur ou la recherche change.
+# - Données : WORDS = [[pt, fr, phon, normal, slow], ...] (pools/_words.<hash>.js, ou inline)
+# - Recherche : index de trigrammes précalculé par le build (SEARCH, pools/_search.<hash>.js),
+#   interrogé par filterCards ; sans lui, l'index est construit ici à partir de WORDS
+# - Le "Mode Quiz" (classe quiz-mode sur <body>) reste celui des leçons
+# - Pas de f-string autour du JS pour éviter les soucis d'accolades
+
+def get_word_list_js() -> str:
+    return """function WordList(el, words, search){
+  const GAP = 12, MIN_COL = 260, OVERSCAN = 3, RESIZE_MS = 150;
+  let view = words.map((_, i) => i);        // indices affichés (après recherche)
+  let cols = 1, first = -1, last = -1, frame = 0, width = -1, resizeTimer = 0;
+  let rowH = new Float64Array(0);           // hauteur mesurée de chaque rangée (0 : jamais affichée)
+  let tops = new Float64Array(1);           // tops[r] : position de la rangée r ; tops[rows] : hauteur totale
+  let est = 100, estimated = false, dirty = true;
+  const inner = document.createElement('div');
+  inner.className = 'grid';
+  el.appendChild(inner);
+
+  function button(label, src){
+    const b = document.createElement('button');
+    b.textContent = label; b.onclick = () => play(src);
+    return b;
+  }
+  function div(cls, text){
+    const d = document.createElement('div');
+    d.className = cls; if (text !== undefined) d.textContent = text;
+    return d;
+  }
+  function card(w, label){
+    const c = div('card'), texts = div('texts'), box = document.createElement('div'), actions = div('actions');
+    texts.appendChild(div('label badge', label));
+    box.appendChild(div('pt', w[0]));
+    if (w[2]) box.appendChild(div('phon', '[' + w[2] + ']'));
+    box.appendChild(div('fr', w[1]));
+    texts.appendChild(box);
+    actions.appendChild(button('▶️ Écouter', w[3] || ''));
+    if (w[4]) actions.appendChild(button('🐢 Lent', w[4]));
+    c.appendChild(texts); c.appendChild(actions);
+    return c;
+  }
+  // Rangées à (re)mesurer : nouvelle largeur (colonnes : même règle que .grid, auto-fill minmax(260px,1fr))
+  // ou nouvelle liste affichée
+  function reset(){
+    width = el.clientWidth;
+    cols = Math.max(1, Math.floor((width + GAP) / (MIN_COL + GAP)));
+    rowH = new Float64Array(Math.ceil(view.length / cols));
+    estimated = false; dirty = true;
+    first = last = -1;
+  }
+  function layout(){
+    if (!dirty) return;
+    const rows = rowH.length;
+    tops = new Float64Array(rows + 1);
+    for (let r = 0; r < rows; r++) tops[r + 1] = tops[r] + (rowH[r] || est) + GAP;
+    el.style.height = Math.max(0, tops[rows] - GAP) + 'px';
+    dirty = false;
+  }
+  function rowAt(y){                        // dernière rangée qui commence avant y (recherche dichotomique)
+    let lo = 0, hi = rowH.length - 1;
+    while (lo < hi){ const mid = (lo + hi + 1) >> 1; if (tops[mid] <= y) lo = mid; else hi = mid - 1; }
+    return lo;
+  }
+  function render(){
+    frame = 0;
+    layout();
+    const rows = rowH.length;
+    const top = el.getBoundingClientRect().top;
+    const from = Math.min(rows, Math.max(0, rowAt(-top) - OVERSCAN));
+    const to = Math.max(from, Math.min(rows, rowAt(window.innerHeight - top) + 1 + OVERSCAN));
+    if (from === first && to === last) return;
+    first = from; last = to;
+    const frag = document.createDocumentFragment();
+    for (let k = from * cols; k < Math.min(view.length, to * cols); k++) frag.appendChild(card(words[view[k]], String(view[k] + 1)));
+    inner.replaceChildren(frag);
+    inner.style.transform = 'translateY(' + tops[from] + 'px)';
+    // Hauteurs réelles : les cartes d'une rangée sont étirées à sa hauteur, la première suffit
+    let changed = false, sum = 0;
+    for (let r = from; r < to; r++){
+      const h = inner.children[(r - from) * cols].offsetHeight;
+      sum += h;
+      if (h && h !== rowH[r]){ rowH[r] = h; changed = true; }
+    }
+    if (!estimated && to > from){ est = sum / (to - from) || est; estimated = true; }
+    // Positions recalculées ; les rangées visibles peuvent changer (rangées plus basses que l'estimation)
+    if (changed){ dirty = true; schedule(); }
+  }
+  function schedule(){ if (!frame) frame = requestAnimationFrame(render); }
+
+  this.index = search ? new SearchIndex(search) : SearchIndex.build(words.map(w => searchKey(w[0], w[1], w[2])));
+  // Indices à afficher (résultat de this.index.query), null pour tout afficher
+  this.setView = function(indices){
+    view = indices || words.map((_, i) => i);
+    reset();
+    schedule();
+  };
+  window.addEventListener('scroll', schedule, { passive: true });
+  // Redimensionnement : mesure refaite une fois la fenêtre stabilisée, et seulement si la largeur a changé
+  // (la barre d'adresse mobile qui se replie ne change que la hauteur)
+  window.addEventListener('resize', () => {
+    schedule();
+    clearTimeout(resizeTimer);
+    resizeTimer = setTimeout(() => { if (el.clientWidth !== width){ reset(); schedule(); } }, RESIZE_MS);
+  });
+  reset(); render();
+}
+function startWordList(WORDS, SEARCH){
+  window.wordList = new WordList(document.getElementById('list'), WORDS, SEARCH);
+}
+"""
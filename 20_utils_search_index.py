@@ -0,0 +1,60 @@
+# 20_utils_search_index.py
+# Index de recherche précalculé pour "Tous les mots" (et clés des cartes de leçon) :
+# - texte normalisé : minuscules, sans accents (NFD puis retrait des diacritiques), espaces réduits
+# - clé d'un mot : pt, fr et phon normalisés, séparés par "\n" (une recherche ne déborde pas d'un champ à l'autre)
+# - trigrammes -> liste des mots qui les contiennent (indices croissants, écarts en base 36)
+# Le pendant JS (foldText / SearchIndex) est dans 03_assets_base_js_common.py : les deux doivent rester alignés.
+
+import json
+import re
+import unicodedata
+
+NGRAM = 3
+_MARKS = re.compile("[\u0300-\u036f]")   # même plage que le JS (normalize('NFD') + replace)
+_SPACES = re.compile(r"\s+")
+
+def fold_text(text: str) -> str:
+    """Texte comparable : sans accents, en minuscules, espaces réduits ("Ação " -> "acao")."""
+    text = _MARKS.sub("", unicodedata.normalize("NFD", text or "")).lower()
+    return _SPACES.sub(" ", text).strip()
+
+def search_key(pt: str, fr: str, phon: str = "") -> str:
+    return "\n".join((fold_text(pt), fold_text(fr), fold_text(phon)))
+
+def _b36(n: int) -> str:
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    s = ""
+    while True:
+        n, r = divmod(n, 36)
+        s = digits[r] + s
+        if not n:
+            return s
+
+def build_search_index(words) -> dict:
+    """
+    { "n": 3, "keys": [clé par mot], "grams": { trigramme: "écarts,en,base36" } }
+    Les indices sont ceux de `words` (même ordre que WORDS de l'accueil).
+    Les trigrammes contenant un espace ou un séparateur de champ ne sont pas indexés
+    (une recherche est découpée en termes sans espace).
+    """
+    keys = [search_key(w.get("pt", ""), w.get("fr", ""), w.get("phon", "")) for w in words]
+    postings = {}
+    for i, key in enumerate(keys):
+        seen = set()
+        for j in range(len(key) - NGRAM + 1):
+            gram = key[j:j + NGRAM]
+            if gram in seen or " " in gram or "\n" in gram:
+                continue
+            seen.add(gram)
+            postings.setdefault(gram, []).append(i)
+    grams = {}
+    for gram, ids in postings.items():
+        prev, deltas = 0, []
+        for i in ids:
+            deltas.append(_b36(i - prev))
+            prev = i
+        grams[gram] = ",".join(deltas)
+    return {"n": NGRAM, "keys": keys, "grams": grams}
+
+def to_search_index_js(words) -> str:
+    return json.dumps(build_search_index(words), ensure_ascii=False, separators=(",", ":"), sort_keys=True)
@@ -0,0 +1,74 @@
+# 21_pages_build_search_bench.py
+# Banc d'essai de la recherche (page de développement, non liée depuis l'accueil) :
+# vocabulaire synthétique de 10 000 et 100 000 mots, temps par requête
+# - "linéaire" : l'ancien filtrage (includes sur pt/fr en minuscules, sans le coût du DOM)
+# - "index"    : SearchIndex (trigrammes) tel qu'utilisé par filterCards, construit dans le navigateur
+# Activé par SEARCH_BENCH dans 01_main.py.
+
+from pathlib import Path
+from utils_write_html import write_html
+
+BENCH_JS = """function benchWords(n, seed){
+  let s = seed || 1;
+  const rnd = () => (s = (s * 1103515245 + 12345) % 2147483648) / 2147483648;
+  const pick = a => a[Math.floor(rnd() * a.length)];
+  const PT = ['ca','ção','lã','mé','po','ra','tu','vi','ões','nha','lho','de','sa','bé','gu','ri','cô','já','es','ter'];
+  const FR = ['le','ma','é','tion','ri','por','chè','ve','dou','ne','ça','pré','mi','ro','ble','fê'];
+  const word = (syl, k) => { let w = ''; for (let i = 0; i < k; i++) w += pick(syl); return w; };
+  const out = [];
+  for (let i = 0; i < n; i++){
+    out.push([word(PT, 2 + Math.floor(rnd() * 3)) + (rnd() < .3 ? ' ' + word(PT, 2) : ''),
+              word(FR, 2 + Math.floor(rnd() * 3)), word(PT, 2)]);
+  }
+  return out;
+}
+function timeMs(f, reps){
+  const t0 = performance.now();
+  for (let r = 0; r < reps; r++) f();
+  return (performance.now() - t0) / reps;
+}
+function runBench(){
+  const QUERIES = ['a', 'ca', 'cao', 'ção', 'nhadé', 'ter es', 'zzz'];
+  const rows = [];
+  for (const n of [10000, 100000]){
+    const words = benchWords(n, 7);
+    const lower = words.map(w => [w[0].toLowerCase(), w[1].toLowerCase()]);
+    let index;
+    const tBuild = timeMs(() => { index = SearchIndex.build(words.map(w => searchKey(w[0], w[1], w[2]))); }, 1);
+    rows.push([n, 'construction de l\\'index', '', '', tBuild.toFixed(1)]);
+    const reps = n > 50000 ? 5 : 20;
+    for (const q of QUERIES){
+      let hits = 0;
+      const tLin = timeMs(() => { hits = 0; for (const w of lower) if (w[0].includes(q) || w[1].includes(q)) hits++; }, reps);
+      // query('') remet l'index à zéro : chaque mesure part d'une recherche "à froid"
+      const tIdx = timeMs(() => { index.query(''); index.query(q); }, reps);
+      rows.push([n, q, String(index.query(q).length) + ' (' + hits + ')', tLin.toFixed(2), tIdx.toFixed(2)]);
+    }
+    // Saisie lettre par lettre : chaque requête ne filtre que les résultats de la précédente
+    const typed = 'coração';
+    index.query('');
+    const tTyped = timeMs(() => { for (let k = 1; k <= typed.length; k++) index.query(typed.slice(0, k)); index.query(''); }, reps);
+    rows.push([n, 'saisie « ' + typed + ' » (' + typed.length + ' requêtes)', '', '', tTyped.toFixed(2)]);
+  }
+  const tbody = document.getElementById('bench-rows');
+  tbody.innerHTML = rows.map(r => '<tr>' + r.map(c => '<td>' + c + '</td>').join('') + '</tr>').join('');
+}
+"""
+
+def build_search_bench(out_dir: Path, assets, cache=None):
+    out_path = out_dir / "bench-search.html"
+    if cache is not None and not cache.need(out_path, assets.key()):
+        return
+    body = """    <div class="quiz-card">
+      <div class="row">
+        <button onclick="runBench()">⏱️ Lancer le banc d'essai</button>
+        <span class="small">Temps moyens en ms ; "résultats" : index (linéaire). La recherche normalisée trouve aussi les formes sans accents.</span>
+      </div>
+      <table class="small" style="width:100%;text-align:left">
+        <thead><tr><th>Mots</th><th>Requête</th><th>Résultats</th><th>Linéaire (ms)</th><th>Index (ms)</th></tr></thead>
+        <tbody id="bench-rows"></tbody>
+      </table>
+    </div>
+    """
+    write_html(out_path, "Banc d'essai — recherche", "Recherche linéaire vs index de trigrammes (vocabulaire synthétique).",
+               body, BENCH_JS, assets=assets)
@@ -0,0 +1,134 @@
+# 22_utils_audio_sprites.py
+# Sprites audio : les clips "normal" d'une portée (leçon, ou tout le vocabulaire par paquets) concaténés
+# dans un seul MP3, pour une requête HTTP au lieu d'une par item.
+# - sprites/<scope>[.<n>].<hash>.mp3 : trames MP3 des clips, bout à bout (balises ID3 et en-têtes Xing/Info retirés)
+# - pools/<scope>.sprites.<hash>.js : SPRITES = { sprites: [{ file, clips: [[src, début_s, durée_s], ...] }] }
+# Les durées viennent des en-têtes de trames (aucune dépendance) ; un clip illisible (WAV, autre
+# fréquence d'échantillonnage...) est simplement laissé hors du sprite : play() retombe sur son fichier.
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pages_to_quiz_pool_js import write_pool_file
+from utils_write_html import write_if_changed
+
+SPRITE_MAX_CLIPS = 100    # clips par fichier sprite (le vocabulaire global est découpé en paquets)
+
+# Débits (kbit/s) Layer III : MPEG-1, puis MPEG-2/2.5
+_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}   # clé : bits de version
+
+def _id3v2_size(data: bytes) -> int:
+    if data[:3] != b"ID3" or len(data) < 10:
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    return 10 + size + (10 if data[5] & 0x10 else 0)
+
+def parse_mp3(data: bytes) -> Optional[Tuple[bytes, int, int, int]]:
+    """
+    Trames audio d'un MP3 (Layer III) : (trames concaténées, fréquence, canaux, échantillons)
+    ou None si le fichier n'est pas un MP3 lisible de bout en bout.
+    """
+    pos = _id3v2_size(data)
+    end = len(data) - (128 if data[-128:-125] == b"TAG" else 0)
+    frames, rate, channels, samples, first = [], 0, 0, 0, True
+    while pos + 4 <= end:
+        b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+        version, layer = (b1 >> 3) & 3, (b1 >> 1) & 3
+        br_idx, sr_idx = b2 >> 4, (b2 >> 2) & 3
+        if data[pos] != 0xFF or (b1 & 0xE0) != 0xE0 or version == 1 or layer != 1 or br_idx in (0, 15) or sr_idx == 3:
+            return None
+        mpeg1 = version == 3
+        sr = _RATES[version][sr_idx]
+        size = (144 if mpeg1 else 72) * _BITRATES[1 if mpeg1 else 2][br_idx] * 1000 // sr + ((b2 >> 1) & 1)
+        ch = 1 if (b3 >> 6) == 3 else 2
+        if pos + size > end or (rate and (sr, ch) != (rate, channels)):
+            return None
+        rate, channels = sr, ch
+        frame = data[pos:pos + size]
+        pos += size
+        if first:
+            first = False
+            # Première trame "Xing"/"Info"/"VBRI" : métadonnées (nombre de trames du fichier seul), pas du son
+            side = (17 if ch == 1 else 32) if mpeg1 else (9 if ch == 1 else 17)
+            tag_at = 4 + (0 if b1 & 1 else 2) + side
+            if frame[tag_at:tag_at + 4] in (b"Xing", b"Info") or frame[36:40] == b"VBRI":
+                continue
+        frames.append(frame)
+        samples += 1152 if mpeg1 else 576
+    if not frames:
+        return None
+    return b"".join(frames), rate, channels, samples
+
+def build_sprite(root: Path, srcs: List[str]) -> Tuple[bytes, List[list]]:
+    """Concatène les clips lisibles (même format que le premier) ; retourne (mp3, [[src, début, durée], ...])."""
+    parts, clips, fmt, t = [], [], None, 0.0
+    for src in srcs:
+        try:
+            parsed = parse_mp3((root / src).read_bytes())
+        except OSError:
+            parsed = None
+        if not parsed or (fmt and parsed[1:3] != fmt):
+            continue
+        audio, rate, channels, samples = parsed
+        fmt = (rate, channels)
+        dur = samples / rate
+        parts.append(audio)
+        clips.append([src, round(t, 4), round(dur, 4)])
+        t += dur
+    return b"".join(parts), clips
+
+# Une portée est demandée par le quiz puis par la dictée : construite une seule fois par build
+_written: Dict[tuple, str] = {}
+_files: Dict[str, List[str]] = {}   # manifeste SPRITES -> fichiers .mp3 qu'il référence
+
+def sprite_files(src: str) -> List[str]:
+    """Fichiers écrits pour le manifeste `src` (lui-même et ses .mp3), pour le cache de build."""
+    return [src, *_files.get(src, [])] if src else []
+
+def write_sprites(out_dir: Path, root: Path, scope: str, words, max_clips: int = SPRITE_MAX_CLIPS) -> str:
+    """
+    Écrit les sprites de la portée `scope` pour les audios "normal" de `words`.
+    Retourne le chemin (relatif) du fichier SPRITES à charger par la page, ou "" si aucun clip n'est exploitable.
+    """
+    srcs = list(dict.fromkeys(w.get("files", {}).get("normal") for w in words if (w.get("files") or {}).get("normal")))
+    key = (str(out_dir), str(root), scope, tuple(srcs), max_clips)
+    if key in _written:
+        return _written[key]
+
+    sprites_dir = out_dir / "sprites"
+    chunks = [srcs[i:i + max_clips] for i in range(0, len(srcs), max_clips)]
+    table, keep = [], set()
+    for n, chunk in enumerate(chunks, start=1):
+        audio, clips = build_sprite(root, chunk)
+        if len(clips) < 2:   # rien à regrouper
+            continue
+        name = f"{scope}.{n}" if len(chunks) > 1 else scope
+        fname = f"{name}.{hashlib.sha1(audio).hexdigest()[:10]}.mp3"
+        path = sprites_dir / fname
+        if not path.exists():
+            sprites_dir.mkdir(parents=True, exist_ok=True)
+            write_if_changed(path, audio)
+        keep.add(fname)
+        table.append({"file": f"sprites/{fname}", "clips": clips})
+
+    # Anciennes versions (et paquets devenus inutiles) de cette portée
+    stale = re.compile(rf"{re.escape(scope)}(\.\d+)?\.[0-9a-f]{{10}}\.mp3")
+    if sprites_dir.exists():
+        for old in sprites_dir.glob(f"{scope}.*mp3"):
+            if old.name not in keep and stale.fullmatch(old.name):
+                old.unlink()
+
+    src = ""
+    if table:
+        data = json.dumps({"sprites": table}, ensure_ascii=False, separators=(",", ":"))
+        src = write_pool_file(out_dir, f"{scope}.sprites", data, var_name="SPRITES")
+        _files[src] = [t["file"] for t in table]
+    _written[key] = src
+    return src
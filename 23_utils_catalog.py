@@ -0,0 +1,136 @@
+# 23_utils_catalog.py
+# Lecture du catalogue SQLite produit par 00000_script_1.py --catalog (schéma : CATALOG_SCHEMA dans ce script).
+# Même interface que utils_load_json.Manifest (count, itération, fingerprint), plus des accès indexés :
+# - get_words(ids)     : mots par id, sans parcourir le vocabulaire
+# - lessons_index()    : équivalent de lessons/_index.json ; lesson(lid) : de lessons/<lid>.json
+# - changed_since(n)   : mots / leçons modifiés ou supprimés après le build n
+# Une connexion par processus (rouverte après fork), en lecture seule.
+# Utilisé seulement si l'empreinte des manifestes JSON enregistrée au build (builds.sources_sha1) correspond
+# aux fichiers présents : les dates des fichiers ne comptent pas (checkout, copie...).
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+CATALOG_NAME = "catalog.sqlite"
+CATALOG_VERSION = 2
+_BATCH = 500   # variables par requête (limite SQLite : 999 sur les anciennes versions)
+
+class Catalog:
+    def __init__(self, path: Path):
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid = None
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version != CATALOG_VERSION:
+            raise SystemExit(f"[ERREUR] version de catalogue non prise en charge : {version} ({path})")
+        row = self.db.execute("SELECT id, words_sha1, sources_sha1 FROM builds ORDER BY id DESC LIMIT 1").fetchone()
+        if row is None:
+            raise SystemExit(f"[ERREUR] catalogue vide : {path}")
+        self.build, self._sha1, self.sources_sha1 = row
+        self.version = version
+        self.count = self.db.execute("SELECT COUNT(*) FROM words WHERE removed_in IS NULL").fetchone()[0]
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None or self._pid != os.getpid():
+            self._db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            self._pid = os.getpid()
+        return self._db
+
+    def __getstate__(self):
+        # Transmis aux processus fils (spawn) : la connexion est rouverte de l'autre côté
+        state = dict(self.__dict__)
+        state["_db"] = None
+        return state
+
+    def __iter__(self) -> Iterator[dict]:
+        for (data,) in self.db.execute("SELECT data FROM words WHERE removed_in IS NULL ORDER BY position"):
+            yield json.loads(data)
+
+    def fingerprint(self) -> str:
+        """Empreinte des mots, calculée par le script 1 à l'écriture (aucun parcours ici)."""
+        return self._sha1
+
+    def get_words(self, ids: Iterable[str]) -> Dict[str, dict]:
+        ids = list(ids)
+        found = {}
+        for i in range(0, len(ids), _BATCH):
+            chunk = ids[i:i + _BATCH]
+            marks = ",".join("?" * len(chunk))
+            for wid, data in self.db.execute(
+                    f"SELECT id, data FROM words WHERE removed_in IS NULL AND id IN ({marks})", chunk):
+                found[wid] = json.loads(data)
+        return found
+
+    def lessons_index(self) -> dict:
+        rows = self.db.execute("SELECT id, data FROM lessons WHERE removed_in IS NULL ORDER BY position")
+        return {lid: json.loads(data) for lid, data in rows}
+
+    def lesson(self, lid: str) -> dict:
+        row = self.db.execute("SELECT data FROM lessons WHERE id = ? AND removed_in IS NULL", (lid,)).fetchone()
+        if row is None:
+            raise KeyError(lid)
+        return json.loads(row[0])
+
+    def changed_since(self, build: int) -> dict:
+        """{"words": {id: "modifié"|"supprimé"}, "lessons": {...}} pour les builds postérieurs à `build`."""
+        out = {}
+        for table in ("words", "lessons"):
+            rows = self.db.execute(f"SELECT id, removed_in FROM {table} WHERE changed_in > ? ORDER BY id", (build,))
+            out[table] = {rid: ("supprimé" if removed else "modifié") for rid, removed in rows}
+        return out
+
+def manifests_sha1(root: Path) -> str:
+    """Empreinte du contenu des manifestes JSON (même calcul que manifests_sha1 dans 00000_script_1.py)."""
+    h = hashlib.sha1()
+    for rel in ("manifest_global.jsonl", "manifest_global.json", "lessons/_index.json"):
+        p = root / rel
+        if p.exists():
+            h.update(rel.encode("utf-8") + b"\0" + p.read_bytes() + b"\0")
+    return h.hexdigest()
+
+def open_catalog(root: Path) -> Optional[Catalog]:
+    """
+    Catalogue de `root`, ou None s'il n'existe pas, s'il est d'une version antérieure, ou s'il n'a pas été écrit
+    avec les manifestes JSON présents (script 1 relancé sans --catalog : les JSON font alors foi).
+    """
+    path = root / CATALOG_NAME
+    if not path.exists():
+        return None
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        version = db.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        db.close()
+    if version != CATALOG_VERSION:
+        print(f"⚠️ {path} ignoré : version {version} (relancer le script 1 avec --catalog)")
+        return None
+    catalog = Catalog(path)
+    if catalog.sources_sha1 != manifests_sha1(root):
+        print(f"⚠️ {path} ignoré : écrit pour d'autres manifestes JSON que ceux présents")
+        return None
+    return catalog
+
+# -----------------------------
+# Exécution directe : changements depuis un build
+# -----------------------------
+if __name__ == "__main__":
+    """
+    Usage:
+      python 23_utils_catalog.py <root> [build]
+    """
+    if len(sys.argv) < 2:
+        print("Usage:\n  python 23_utils_catalog.py <root> [build]")
+        sys.exit(1)
+    catalog = Catalog(Path(sys.argv[1]) / CATALOG_NAME)
+    since = int(sys.argv[2]) if len(sys.argv) > 2 else catalog.build - 1
+    print(f"Build courant : {catalog.build} ; {catalog.count} mot(s)")
+    for table, rows in catalog.changed_since(since).items():
+        print(f"{table} modifiés depuis le build {since} : {len(rows)}")
+        for rid, what in rows.items():
+            print(f"  {what:9} {rid}")
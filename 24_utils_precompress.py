@@ -0,0 +1,100 @@
+# 24_utils_precompress.py
+# Compression après le build : <fichier>.gz (et <fichier>.br si le module brotli est installé) à côté de
+# chaque fichier texte écrit ou conservé par ce build (pages HTML, assets JS/CSS, pools, sw.js, precache),
+# pour les serveurs qui servent des fichiers précompressés (nginx gzip_static / brotli_static...) au lieu de
+# compresser à chaque requête. La liste vient du build (cache de build, service worker) et non du dossier :
+# ni les entrées (lessons/*.json, manifest_global.json, vocab.json...) ni les pages d'anciennes leçons
+# restées dans le dossier ne sont compressées.
+# - fichiers inchangés ignorés : empreinte du contenu dans <OUT_DIR>/.precompress_cache.json
+# - compression en parallèle (threads : zlib et brotli relâchent le GIL)
+# - bilan par classe de fichiers (taille brute, gzip, brotli) pour suivre le poids des pages
+
+import gzip
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from utils_build_cache import BuildCache
+from utils_write_html import write_if_changed
+
+try:
+    import brotli   # dépendance optionnelle : sans elle, seuls les .gz sont produits
+except ImportError:
+    brotli = None
+
+TEXT_SUFFIXES = (".html", ".js", ".css", ".json")
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+def _artifact_class(path: Path) -> str:
+    if path.parent.name == "pools":
+        return "pools"          # données des pages (WORDS, POOL, SPRITES, index de recherche)
+    return path.suffix.lstrip(".")
+
+def _sources(out_dir: Path, outputs: Iterable[str]) -> List[Path]:
+    """Fichiers texte parmi `outputs` (chemins relatifs à out_dir), hors fichiers cachés."""
+    found = {out_dir / rel for rel in outputs if Path(rel).suffix in TEXT_SUFFIXES and not Path(rel).name.startswith(".")}
+    return sorted(path for path in found if path.is_file())
+
+def _compress(path: Path, data: bytes, formats) -> Dict[str, int]:
+    sizes = {}
+    for ext in ("gz", "br"):
+        sibling = path.with_name(f"{path.name}.{ext}")
+        if ext not in formats:
+            if sibling.exists():
+                sibling.unlink()   # compressé depuis une ancienne version : ne plus le servir
+            continue
+        if ext == "gz":
+            out = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)   # mtime=0 : octets reproductibles
+        else:
+            out = brotli.compress(data, quality=BROTLI_QUALITY)
+        write_if_changed(sibling, out)
+        sizes[ext] = len(out)
+    return sizes
+
+def precompress(out_dir: Path, outputs: Iterable[str], force: bool = False, jobs: Optional[int] = None) -> str:
+    """
+    Écrit les .gz/.br manquants ou périmés des fichiers `outputs` (chemins relatifs à out_dir), supprime
+    ceux dont la source n'en fait plus partie ; retourne le bilan.
+    """
+    formats = ("gz", "br") if brotli is not None else ("gz",)
+    cache = BuildCache(out_dir / ".precompress_cache.json", salt=f"{formats}:{GZIP_LEVEL}:{BROTLI_QUALITY}", force=force)
+
+    sources = _sources(out_dir, outputs)
+    # Source disparue ou plus produite par le build (page d'une ancienne leçon, entrée compressée par une
+    # version antérieure) : .gz/.br supprimé
+    keep = set(sources)
+    for sibling in [*out_dir.rglob("*.gz"), *out_dir.rglob("*.br")]:
+        if sibling.with_suffix("").suffix in TEXT_SUFFIXES and sibling.with_suffix("") not in keep:
+            sibling.unlink()
+
+    def one(path: Path):
+        data = path.read_bytes()
+        siblings = [path.with_name(f"{path.name}.{ext}") for ext in formats]
+        # Décision enregistrée sous le nom du .gz (need() vérifie aussi qu'il existe)
+        stale = cache.need(siblings[0], hashlib.sha1(data).hexdigest())
+        if not stale and all(s.exists() for s in siblings):
+            return path, len(data), {ext: s.stat().st_size for ext, s in zip(formats, siblings)}, False
+        return path, len(data), _compress(path, data, formats), True
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        results = list(pool.map(one, sources))
+    cache.save()
+
+    totals: Dict[str, Dict[str, int]] = {}
+    done = 0
+    for path, raw, sizes, built in results:
+        t = totals.setdefault(_artifact_class(path), {"n": 0, "raw": 0, "gz": 0, "br": 0})
+        t["n"] += 1
+        t["raw"] += raw
+        for ext, size in sizes.items():
+            t[ext] += size
+        done += built
+    lines = [f"🗜️  Précompression : {done} fichier(s) compressé(s), {len(results) - done} inchangé(s)"
+             + ("" if brotli is not None else " (module brotli absent : .gz seulement)")]
+    for cls, t in sorted(totals.items()):
+        ratios = " ; ".join(f"{ext} {t[ext] / 1024:.0f} Ko ({t[ext] / max(1, t['raw']):.0%})" for ext in formats)
+        lines.append(f"   - {cls:5} : {t['n']:4} fichier(s), {t['raw'] / 1024:.0f} Ko -> {ratios}")
+    return "\n".join(lines)
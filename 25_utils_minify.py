@@ -0,0 +1,169 @@
+# 25_utils_minify.py
+# Minification des assets CSS/JS (mode "production" : MINIFY dans 01_main.py), sans dépendance.
+# Volontairement prudente, pour des sources écrites à la main comme celles de 02/03/04/13/19 :
+# - commentaires retirés, indentation et espaces superflus supprimés
+# - chaînes, gabarits `...${}...` et expressions régulières recopiés tels quels
+# - les retours à la ligne sont gardés là où l'insertion automatique de ";" pourrait en dépendre
+#   (seuls ceux qui suivent "{ ( [ , ; :" ou précèdent "} ) ] , ; ." disparaissent)
+# Tests : tests/test_minify.py (cas délicats + sources réelles, re-découpées en jetons).
+
+import re
+from typing import Iterator, List, Tuple
+
+_WORD = re.compile(r"[\w$\u0080-\uffff]")
+_KEYWORDS_BEFORE_EXPR = {"return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw",
+                         "case", "do", "else", "yield", "await"}
+_NL_DROP_AFTER = "{([,;:"
+_NL_DROP_BEFORE = "})],;."
+
+def _skip_string(src: str, i: int) -> int:
+    """Fin (exclue) de la chaîne '...' ou "..." qui commence en i."""
+    quote, i = src[i], i + 1
+    while i < len(src) and src[i] != quote:
+        i += 2 if src[i] == "\\" else 1
+    return i + 1
+
+def _skip_template(src: str, i: int) -> int:
+    """Fin (exclue) du gabarit `...` qui commence en i, expressions ${...} (imbriquées) comprises."""
+    i += 1
+    while i < len(src) and src[i] != "`":
+        if src[i] == "\\":
+            i += 2
+        elif src.startswith("${", i):
+            i, depth = i + 2, 1
+            while i < len(src) and depth:
+                c = src[i]
+                if c in "'\"":
+                    i = _skip_string(src, i)
+                    continue
+                if c == "`":
+                    i = _skip_template(src, i)
+                    continue
+                depth += (c == "{") - (c == "}")
+                i += 1
+        else:
+            i += 1
+    return i + 1
+
+def _skip_regex(src: str, i: int) -> int:
+    """Fin (exclue) de l'expression /.../drapeaux qui commence en i."""
+    i, in_class = i + 1, False
+    while i < len(src):
+        c = src[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            break
+        i += 1
+    i += 1
+    while i < len(src) and _WORD.match(src[i]):
+        i += 1
+    return i
+
+def js_tokens(src: str) -> Iterator[Tuple[str, str]]:
+    """Jetons (type, texte) : ws, comment, str, regex, word, punct."""
+    i, prev = 0, None   # prev : dernier jeton significatif (pour distinguer division et expression régulière)
+    while i < len(src):
+        c = src[i]
+        if c.isspace():
+            j = i + 1
+            while j < len(src) and src[j].isspace():
+                j += 1
+            kind = "ws"
+        elif src.startswith("//", i):
+            j = src.find("\n", i)
+            j = len(src) if j < 0 else j
+            kind = "comment"
+        elif src.startswith("/*", i):
+            j = src.find("*/", i + 2)
+            j = len(src) if j < 0 else j + 2
+            kind = "comment"
+        elif c in "'\"":
+            j, kind = _skip_string(src, i), "str"
+        elif c == "`":
+            j, kind = _skip_template(src, i), "str"
+        elif c == "/" and (prev is None or (prev[0] == "punct" and prev[1] not in ")]}")
+                           or (prev[0] == "word" and prev[1] in _KEYWORDS_BEFORE_EXPR)):
+            j, kind = _skip_regex(src, i), "regex"
+        elif _WORD.match(c):
+            j = i + 1
+            while j < len(src) and (_WORD.match(src[j]) or (src[j] == "." and src[i].isdigit())):
+                j += 1
+            kind = "word"
+        else:
+            j, kind = i + 1, "punct"
+        tok = (kind, src[i:j])
+        if kind not in ("ws", "comment"):
+            prev = tok
+        yield tok
+        i = j
+
+def _needs_space(prev: Tuple[str, str], nxt: Tuple[str, str]) -> bool:
+    a, b = prev[1][-1], nxt[1][0]
+    if _WORD.match(b) and (_WORD.match(a) or prev[0] == "regex"):
+        return True
+    return (a in "+-" and b == a) or (a == "/" and b in "/*")
+
+def minify_js(src: str) -> str:
+    out: List[Tuple[str, str]] = []
+    space = newline = False
+    for tok in js_tokens(src):
+        kind, text = tok
+        if kind in ("ws", "comment"):
+            space = True
+            newline = newline or "\n" in text
+            continue
+        if out:
+            prev = out[-1]
+            if newline and prev[1][-1] not in _NL_DROP_AFTER and text[0] not in _NL_DROP_BEFORE:
+                out.append(("ws", "\n"))
+            elif space and _needs_space(prev, tok):
+                out.append(("ws", " "))
+        out.append(tok)
+        space = newline = False
+    return "".join(text for _, text in out)
+
+_CSS_TOKEN = re.compile(r"""/\*.*?\*/|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|\s+|[^\s"'/]+|/""", re.S)
+
+def minify_css(src: str) -> str:
+    out: List[str] = []
+    space = False
+    blocks: List[bool] = []   # pile des blocs ouverts : True = déclarations, False = règles (@media...)
+    prelude = ""              # texte depuis le dernier { } ou ; (sélecteur ou @règle en cours)
+    for m in _CSS_TOKEN.finditer(src):
+        text = m.group(0)
+        if text.startswith("/*") or text.isspace():
+            space = True
+            continue
+        in_decl = bool(blocks) and blocks[-1]
+        # Espace avant ":" significatif dans un sélecteur (".x :hover"), pas dans une déclaration
+        tight = "{};,>:" if in_decl else "{};,>"
+        if space and out and out[-1][-1] not in "{};,>:" and text[0] not in tight:
+            out.append(" ")
+        if text[0] not in "\"'":
+            for c in text:
+                if c == "{":
+                    p = prelude.strip()
+                    blocks.append(not p.startswith("@") or p.startswith(("@font-face", "@page")))
+                    prelude = ""
+                elif c == "}":
+                    if blocks:
+                        blocks.pop()
+                    prelude = ""
+                elif c == ";":
+                    prelude = ""
+                else:
+                    prelude += c
+            if text[0] == "}" and out and out[-1].endswith(";"):
+                out[-1] = out[-1].rstrip(";")   # dernier ";" d'un bloc
+            text = re.sub(r";+}", "}", text)
+        else:
+            prelude += text
+        out.append(text)
+        space = False
+    return "".join(out)
@@ -0,0 +1,202 @@
+# 26_pages_build_service_worker.py
+# Service worker du site hébergé (hors ligne d'abord) : les visites suivantes et les quiz sur réseau
+# mobile instable sont servis depuis le cache du navigateur.
+# - precache.<hash>.js : PRECACHE = { core: {url: empreinte}, groups: {groupe: {url: empreinte}} }
+#   core   : pages HTML, assets et pools (+ tous les audios et sprites si audio="all"), chargés à l'installation
+#   groups : audios d'une leçon, chargés à l'ouverture d'une de ses pages (audio="lessons"), selon ce que
+#            la page joue : "clips:<id>" (audios séparés) pour lesson-<id>.html, "sprites:<id>" (sprite de la
+#            leçon) pour quiz-/dictation-<id>.html, ou "clips:<id>" si la leçon n'a pas de sprite.
+#            Un même audio n'est donc pas téléchargé deux fois pour une page ; un clip absent du sprite
+#            est mis en cache à sa première écoute.
+# - sw.js : importe le manifeste ; une entrée de cache par (url, empreinte) : après une mise à jour du site,
+#   seuls les fichiers dont l'empreinte a changé sont retéléchargés, les autres sont supprimés du cache.
+# Les empreintes (sha1) sont mémorisées par (taille, date) dans <OUT_DIR>/.sw_hashes.json : cache local du build,
+# ignoré par git (.gitignore) et jamais préchargé (fichiers cachés exclus), comme .build_cache.json.
+# Désactivé (SERVICE_WORKER = False) alors qu'un sw.js existe : il est remplacé par un service worker
+# qui vide son cache et se désinscrit.
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from utils_write_html import write_if_changed
+
+CACHE_PREFIX = "mon-quiz-"
+
+# Ajouté au JS commun quand le service worker est activé (jamais en file:// : pas de service worker)
+SW_REGISTER_JS = """
+// ---- Service worker (site hébergé) : pages, assets et audios servis depuis le cache ----
+if (typeof navigator !== 'undefined' && 'serviceWorker' in navigator && /^https?:$/.test(location.protocol)){
+  window.addEventListener('load', () => navigator.serviceWorker.register('sw.js').catch(() => {}));
+}
+"""
+
+SW_JS = """const CACHE = '""" + CACHE_PREFIX + """precache';
+const abs = url => new URL(url, self.registration.scope).href;
+const keyOf = (url, hash) => abs(url) + '?__h=' + hash;
+const current = new Map();   // URL absolue -> clé de cache de la version courante
+for (const files of [PRECACHE.core, ...Object.values(PRECACHE.groups)])
+  for (const [url, hash] of Object.entries(files)) current.set(abs(url), keyOf(url, hash));
+
+// Télécharge les fichiers absents du cache (ou dont l'empreinte a changé), 8 à la fois
+async function fill(files){
+  const cache = await caches.open(CACHE);
+  const have = new Set((await cache.keys()).map(r => r.url));
+  const todo = Object.entries(files).filter(([url, hash]) => !have.has(keyOf(url, hash)));
+  for (let i = 0; i < todo.length; i += 8){
+    await Promise.all(todo.slice(i, i + 8).map(async ([url, hash]) => {
+      const res = await fetch(abs(url), { cache: 'no-cache' });
+      if (res.ok) await cache.put(keyOf(url, hash), res);
+    }));
+  }
+}
+
+self.addEventListener('install', e => e.waitUntil(fill(PRECACHE.core).then(() => self.skipWaiting())));
+
+self.addEventListener('activate', e => e.waitUntil((async () => {
+  const keep = new Set(current.values());
+  for (const name of await caches.keys())
+    if (name.startsWith('""" + CACHE_PREFIX + """') && name !== CACHE) await caches.delete(name);
+  const cache = await caches.open(CACHE);
+  for (const req of await cache.keys()) if (!keep.has(req.url)) await cache.delete(req);
+  await self.clients.claim();
+})()));
+
+// Réponse 206 pour les requêtes partielles des éléments <audio> (Safari n'accepte pas un 200)
+async function partial(res, range){
+  const buf = await res.arrayBuffer(), size = buf.byteLength;
+  const m = /bytes=(\\d*)-(\\d*)/.exec(range) || [];
+  let start = m[1] ? +m[1] : 0, end = m[2] ? Math.min(+m[2], size - 1) : size - 1;
+  if (!m[1] && m[2]){ start = Math.max(0, size - +m[2]); end = size - 1; }
+  return new Response(buf.slice(start, end + 1), { status: 206, headers: {
+    'Content-Type': res.headers.get('Content-Type') || 'application/octet-stream',
+    'Content-Range': `bytes ${start}-${end}/${size}`, 'Content-Length': String(end - start + 1), 'Accept-Ranges': 'bytes' } });
+}
+
+async function respond(req, key){
+  const cache = await caches.open(CACHE);
+  const range = req.headers.get('range');
+  const hit = await cache.match(key);
+  if (hit) return range ? partial(hit, range) : hit;
+  const res = await fetch(req);
+  if (!range && res.status === 200) await cache.put(key, res.clone());
+  return res;
+}
+
+const LESSON_PAGE = /\\/(lesson|quiz|dictation)-([^\\/]+)\\.html$/;
+self.addEventListener('fetch', e => {
+  const req = e.request;
+  if (req.method !== 'GET') return;
+  const url = new URL(req.url);
+  url.hash = '';
+  if (url.pathname.endsWith('/')) url.pathname += 'index.html';
+  if (req.mode === 'navigate'){
+    const m = LESSON_PAGE.exec(url.pathname), lid = m && decodeURIComponent(m[2]);
+    const group = m && (m[1] !== 'lesson' && PRECACHE.groups['sprites:' + lid] || PRECACHE.groups['clips:' + lid]);
+    if (group) e.waitUntil(fill(group).catch(() => {}));   // audios de la leçon, en arrière-plan
+  }
+  const key = current.get(url.href);
+  if (key) e.respondWith(respond(req, key));   // hors manifeste : réseau, sans intervention
+});
+"""
+
+SW_KILL_JS = """// Service worker désactivé (SERVICE_WORKER = False) : vide son cache puis se désinscrit
+self.addEventListener('install', () => self.skipWaiting());
+self.addEventListener('activate', e => e.waitUntil((async () => {
+  for (const name of await caches.keys()) if (name.startsWith('""" + CACHE_PREFIX + """')) await caches.delete(name);
+  await self.registration.unregister();
+})()));
+"""
+
+class _Hashes:
+    """Empreintes des fichiers, recalculées seulement si la taille ou la date a changé."""
+    def __init__(self, path: Path):
+        self.path = path
+        try:
+            self.old = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.old = {}
+        self.new = {}
+
+    def get(self, out_dir: Path, rel: str) -> str:
+        st = (out_dir / rel).stat()
+        memo = self.old.get(rel)
+        if memo and memo[:2] == [st.st_size, st.st_mtime_ns]:
+            h = memo[2]
+        else:
+            h = hashlib.sha1((out_dir / rel).read_bytes()).hexdigest()[:10]
+        self.new[rel] = [st.st_size, st.st_mtime_ns, h]
+        return h
+
+    def save(self):
+        write_if_changed(self.path, json.dumps(self.new, sort_keys=True, separators=(",", ":")))
+
+def _audio_urls(words: Iterable[dict]) -> Iterable[str]:
+    for w in words:
+        for kind in ("normal", "slow"):
+            src = (w.get("files") or {}).get(kind)
+            if src:
+                yield src
+
+def build_service_worker(ctx, out_dir: Path, assets, html_names: Iterable[str], audio: str = "lessons") -> str:
+    """
+    Écrit precache.<hash>.js et sw.js pour les pages `html_names` produites par ce build.
+    `audio` : "off" (aucun audio), "lessons" (par leçon, à l'ouverture) ou "all" (tout à l'installation).
+    Retourne le bilan à afficher.
+    """
+    hashes = _Hashes(out_dir / ".sw_hashes.json")
+    files = sorted(n for n in set(html_names) if n.endswith(".html") and (out_dir / n).exists())
+    if not assets.inline:
+        files += sorted(assets.filename(name) for name in assets.assets)
+    if (out_dir / "pools").exists():
+        files += sorted(f"pools/{p.name}" for p in (out_dir / "pools").glob("*.js"))
+    # Sprites : audio d'une portée (leçon, ou "_all" par paquets), mis en cache avec les audios de la portée
+    sprites: Dict[str, list] = {}
+    if audio != "off" and (out_dir / "sprites").exists():
+        for p in sorted((out_dir / "sprites").glob("*.mp3")):
+            m = re.fullmatch(r"(.+?)(?:\.\d+)?\.[0-9a-f]{10}\.mp3", p.name)   # <portée>[.<n>].<hash>.mp3
+            if m:
+                sprites.setdefault(m.group(1), []).append(f"sprites/{p.name}")
+    if audio == "all":
+        files += sorted(set(_audio_urls(ctx.iter_words()))) + [u for urls in sprites.values() for u in urls]
+    core = {rel: hashes.get(out_dir, rel) for rel in files
+            if (out_dir / rel).exists() and not any(p.startswith(".") for p in Path(rel).parts)}
+
+    groups: Dict[str, Dict[str, str]] = {}
+    if audio == "lessons":
+        for lid in ctx.lesson_ids:
+            clips = [u for u in dict.fromkeys(_audio_urls(ctx.lesson_words(lid))) if (out_dir / u).exists()]
+            if clips:
+                groups[f"clips:{lid}"] = {u: hashes.get(out_dir, u) for u in clips}
+            if sprites.get(lid):
+                groups[f"sprites:{lid}"] = {u: hashes.get(out_dir, u) for u in sprites[lid]}
+    hashes.save()
+
+    data = json.dumps({"core": core, "groups": groups}, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    content = f"self.PRECACHE = {data};\n"
+    name = f"precache.{hashlib.sha1(content.encode('utf-8')).hexdigest()[:10]}.js"
+    write_if_changed(out_dir / name, content)
+    for old in out_dir.glob("precache.*.js"):
+        if old.name != name and re.fullmatch(r"precache\.[0-9a-f]{10}\.js", old.name):
+            old.unlink()
+    # Le nom du manifeste change avec son contenu : sw.js change aussi, le navigateur installe la nouvelle version
+    write_if_changed(out_dir / "sw.js", f"importScripts('{name}');\n{SW_JS}")
+
+    size = sum((out_dir / rel).stat().st_size for rel in core)
+    n_audio = len({u for g in groups.values() for u in g})
+    n_lessons = len({name.split(":", 1)[1] for name in groups})
+    return (f"📴 Service worker : {len(core)} fichier(s) préchargés ({size / 1e6:.1f} Mo)"
+            + (f", audios de {n_lessons} leçon(s) ({n_audio} fichiers) chargés à l'ouverture selon la page" if groups else ""))
+
+def service_worker_files(out_dir: Path) -> List[str]:
+    """sw.js et le manifeste precache.<hash>.js courant (les précédents sont supprimés à l'écriture)."""
+    return sorted(p.name for p in [out_dir / "sw.js", *out_dir.glob("precache.*.js")] if p.exists())
+
+def disable_service_worker(out_dir: Path):
+    """Remplace un sw.js existant par sa version qui se désinscrit (les visiteurs en ont un installé)."""
+    if (out_dir / "sw.js").exists():
+        write_if_changed(out_dir / "sw.js", SW_KILL_JS)
+        for old in out_dir.glob("precache.*.js"):
+            old.unlink()
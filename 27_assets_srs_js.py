@@ -0,0 +1,107 @@
+# 27_assets_srs_js.py
+# Répétition espacée (SM-2) pour le quiz QCM et la dictée : les mots dus passent avant les nouveaux,
+# les mots bien connus reviennent de plus en plus rarement.
+# - État par mot dans localStorage, clé "mq-srs:<id>" (id du manifeste, item.id du POOL) :
+#   "échéance_ms,intervalle_j,facilité,répétitions,oublis" ; partagé entre pages globales et leçons
+# - File de priorité (tas binaire) sur les indices du POOL : construite une fois par page (O(N)),
+#   puis O(log N) par question (take) et par réponse (review)
+# - Priorité : mots échus (échéance passée, les plus anciens d'abord), puis nouveaux (ordre aléatoire),
+#   puis mots pas encore dus (échéance la plus proche d'abord)
+# - Chaque entrée de `history` des deux applications alimente le planificateur (srsQuality -> review)
+# - Pas de f-string autour du JS pour éviter les soucis d'accolades
+
+def get_srs_js() -> str:
+    return """const SRS_PREFIX = 'mq-srs:';
+const SRS_DAY_MS = 86400000;
+const SRS_RELEARN_MS = 10 * 60000;   // mot oublié : revu 10 min plus tard
+
+function srsStore(){
+  try { const k = SRS_PREFIX + '__test'; localStorage.setItem(k, '1'); localStorage.removeItem(k); return localStorage; }
+  catch (e) { const m = new Map(); return { getItem: k => m.has(k) ? m.get(k) : null, setItem: (k, v) => m.set(k, String(v)) }; }   // navigation privée : en mémoire
+}
+
+// Note SM-2 (0..5) d'une entrée de history : { correct, timeout, ms, limitMs, grade (dictée) }
+function srsQuality(e){
+  if (!e.correct) return e.timeout ? 0 : 1;
+  if (e.grade === 'accents' || e.grade === 'typo') return 3;   // juste, avec des fautes
+  return (e.ms && e.limitMs && e.ms < e.limitMs / 3) ? 5 : 4;
+}
+
+function Scheduler(pool, now){
+  now = now || Date.now();
+  const store = srsStore();
+  const n = pool.length;
+  const cards = new Array(n);             // [échéance, intervalle, facilité, répétitions, oublis] ou null (nouveau)
+  const prio = new Float64Array(n);
+  const heap = new Int32Array(n);         // indices du POOL ; heap[0] = prochain à réviser
+  const pos = new Int32Array(n).fill(-1); // position dans le tas (-1 : sorti, question en cours)
+  let size = 0;
+  const keyOf = i => SRS_PREFIX + (pool[i].id || pool[i].pt);
+
+  for (let i = 0; i < n; i++){
+    const raw = store.getItem(keyOf(i));
+    const c = raw ? raw.split(',').map(Number) : null;
+    cards[i] = (c && c.length === 5 && c.every(Number.isFinite)) ? c : null;
+    prio[i] = cards[i] ? cards[i][0] : now + Math.random();   // nouveaux : après les échus, avant les autres
+    heap[size] = i; pos[i] = size; size++;
+  }
+
+  const less = (a, b) => prio[heap[a]] < prio[heap[b]];
+  function swap(a, b){ const t = heap[a]; heap[a] = heap[b]; heap[b] = t; pos[heap[a]] = a; pos[heap[b]] = b; }
+  function up(k){ while (k > 0){ const p = (k - 1) >> 1; if (!less(k, p)) break; swap(k, p); k = p; } }
+  function down(k){
+    for (;;){
+      const l = 2 * k + 1, r = l + 1;
+      let m = k;
+      if (l < size && less(l, m)) m = l;
+      if (r < size && less(r, m)) m = r;
+      if (m === k) return;
+      swap(k, m); k = m;
+    }
+  }
+  for (let k = (size >> 1) - 1; k >= 0; k--) down(k);   // tas construit en O(N)
+
+  function push(i){ heap[size] = i; pos[i] = size; size++; up(size - 1); }
+  function pop(){
+    const top = heap[0];
+    size--;
+    if (size > 0){ heap[0] = heap[size]; pos[heap[0]] = 0; down(0); }
+    pos[top] = -1;
+    return top;
+  }
+
+  return {
+    // `k` prochains mots à interroger (sortis du tas jusqu'à leur réponse)
+    take(k){
+      const out = [];
+      while (out.length < k && size > 0) out.push(pop());
+      return out;
+    },
+    // Remet dans le tas les mots tirés mais sans réponse (partie recommencée)
+    release(indices){ for (const i of indices) if (pos[i] === -1) push(i); },
+    // Réponse à POOL[i] avec la note SM-2 q (0..5) : nouvelle échéance, sauvegarde, retour dans le tas
+    review(i, q, at){
+      at = at || Date.now();
+      let [due, ivl, ease, reps, lapses] = cards[i] || [at, 0, 2.5, 0, 0];
+      if (q < 3){
+        reps = 0; lapses += 1; ivl = 0; due = at + SRS_RELEARN_MS;
+      } else {
+        reps += 1;
+        ivl = reps === 1 ? 1 : reps === 2 ? 6 : Math.round(ivl * ease);
+        due = at + ivl * SRS_DAY_MS;
+      }
+      ease = Math.max(1.3, ease + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02));
+      cards[i] = [due, ivl, Math.round(ease * 100) / 100, reps, lapses];
+      try { store.setItem(keyOf(i), cards[i].join(',')); } catch (e) { /* quota : l'état reste en mémoire */ }
+      prio[i] = due;
+      if (pos[i] === -1) push(i);
+    },
+    card(i){ return cards[i]; },
+  };
+}
+"""
+
+if __name__ == "__main__":
+    with open("srs.js", "w", encoding="utf-8") as f:
+        f.write(get_srs_js())
+    print("✅ Fichier srs.js généré")
@@ -0,0 +1,103 @@
+# 28_assets_results_js.py
+# Résultats persistants du quiz QCM et de la dictée (IndexedDB "mon-quiz-results"), lus par stats.html
+# - sessions : une entrée par partie terminée, événements compacts [id, correct 0/1, ms ou -1 si temps écoulé] ;
+#   ajoutée seulement, jamais relue pour les statistiques
+# - words    : agrégats par mot (essais, réussites, temps écoulés, somme des temps de réponse), clé = id du manifeste
+# - rollups  : agrégats cumulés "all", "kind:quiz" / "kind:dictation", "day:AAAA-MM-JJ"
+# Chaque partie met à jour words et rollups dans la même transaction : stats.html lit les agrégats
+# (taille bornée par le vocabulaire et le nombre de jours), quel que soit le nombre de parties.
+# Sans IndexedDB (file:// sur certains navigateurs, navigation privée) : rien n'est enregistré.
+
+def get_results_js() -> str:
+    return """const RESULTS_DB = 'mon-quiz-results';
+let _resultsDb = null;
+
+function resultsDb(){
+  if (_resultsDb) return _resultsDb;
+  return _resultsDb = new Promise(resolve => {
+    let req;
+    try { req = indexedDB.open(RESULTS_DB, 1); } catch (e) { resolve(null); return; }
+    req.onupgradeneeded = () => {
+      const db = req.result;
+      db.createObjectStore('sessions', { autoIncrement: true });
+      db.createObjectStore('words', { keyPath: 'id' });
+      db.createObjectStore('rollups', { keyPath: 'key' });
+    };
+    req.onsuccess = () => resolve(req.result);
+    req.onerror = req.onblocked = () => resolve(null);
+  });
+}
+
+// Jour local "AAAA-MM-JJ" (clé des agrégats quotidiens)
+function resultsDay(at){
+  const d = new Date(at), p = x => String(x).padStart(2, '0');
+  return d.getFullYear() + '-' + p(d.getMonth() + 1) + '-' + p(d.getDate());
+}
+
+// Ajoute les compteurs `d` à l'agrégat `agg`
+function resultsAdd(agg, d, at){
+  for (const k of ['n', 'ok', 'timeouts', 'ms', 'msN', 'sessions']) if (d[k]) agg[k] = (agg[k] || 0) + d[k];
+  agg.last = at;
+  return agg;
+}
+
+// Enregistre une partie terminée (`history` de QuizApp / DictationApp) ; résout true si c'est fait
+function saveResults(kind, history, scope){
+  if (!history.length) return Promise.resolve(false);
+  return resultsDb().then(db => db && new Promise(resolve => {
+    const at = Date.now();
+    const session = { n: 0, ok: 0, timeouts: 0, ms: 0, msN: 0, sessions: 1 };
+    const perWord = new Map();   // un seul get/put par mot, même s'il revient dans la partie
+    for (const e of history){
+      const id = e.id || e.pt;
+      const d = { n: 1, ok: e.correct ? 1 : 0, timeouts: e.timeout ? 1 : 0,
+                  ms: e.timeout ? 0 : Math.round(e.ms || 0), msN: e.timeout ? 0 : 1 };
+      resultsAdd(session, d, at);
+      if (perWord.has(id)) resultsAdd(perWord.get(id).d, d, at);
+      else perWord.set(id, { pt: e.pt || '', fr: e.fr || '', d });
+    }
+    let tx;
+    try { tx = db.transaction(['sessions', 'words', 'rollups'], 'readwrite'); } catch (e) { resolve(false); return; }
+    tx.objectStore('sessions').add({ at, kind, scope: scope || '',
+      events: history.map(e => [e.id || e.pt, e.correct ? 1 : 0, e.timeout ? -1 : Math.round(e.ms || 0)]) });
+    const words = tx.objectStore('words');
+    for (const [id, w] of perWord){
+      const r = words.get(id);
+      r.onsuccess = () => words.put(resultsAdd(r.result || { id, pt: w.pt, fr: w.fr }, w.d, at));
+    }
+    const rollups = tx.objectStore('rollups');
+    for (const key of ['all', 'kind:' + kind, 'day:' + resultsDay(at)]){
+      const r = rollups.get(key);
+      r.onsuccess = () => rollups.put(resultsAdd(r.result || { key }, session, at));
+    }
+    tx.oncomplete = () => resolve(true);
+    tx.onerror = tx.onabort = () => resolve(false);
+  }));
+}
+
+// Agrégats pour stats.html : { rollups: {clé: agrégat}, words: [agrégat par mot] } (null sans IndexedDB)
+function loadResults(){
+  return resultsDb().then(db => db && new Promise(resolve => {
+    const out = { rollups: {}, words: [] };
+    const tx = db.transaction(['words', 'rollups'], 'readonly');
+    tx.objectStore('rollups').getAll().onsuccess = e => { for (const r of e.target.result) out.rollups[r.key] = r; };
+    tx.objectStore('words').getAll().onsuccess = e => { out.words = e.target.result; };
+    tx.oncomplete = () => resolve(out);
+    tx.onerror = () => resolve(null);
+  }));
+}
+
+function clearResults(){
+  return resultsDb().then(db => db && new Promise(resolve => {
+    const tx = db.transaction(['sessions', 'words', 'rollups'], 'readwrite');
+    for (const name of ['sessions', 'words', 'rollups']) tx.objectStore(name).clear();
+    tx.oncomplete = () => resolve(true);
+    tx.onerror = () => resolve(false);
+  }));
+}
+"""
+
+if __name__ == "__main__":
+    with open("results.js", "w", encoding="utf-8") as f:
+        f.write(get_results_js())
+    print("✅ Fichier results.js généré")
@@ -0,0 +1,99 @@
+# 29_pages_build_stats_page.py
+# stats.html : statistiques des parties enregistrées dans IndexedDB (28_assets_results_js.py)
+# - Totaux, par type (QCM / dictée) et par jour (14 derniers) : agrégats "rollups", lus tels quels
+# - Par mot (à revoir, plus lents, plus vus) : agrégats "words", une ligne par mot déjà interrogé
+# Les événements bruts des parties ne sont jamais relus : la page reste rapide après des milliers de parties.
+
+from pathlib import Path
+from utils_write_html import write_html
+
+SCRIPTS = ("results",)   # assets chargés par la page (clé du cache de build)
+
+STATS_JS = """function pct(a){ return a && a.n ? Math.round(100 * (a.ok || 0) / a.n) + ' %' : '—'; }
+function meanS(a){ return a && a.msN ? (a.ms / a.msN / 1000).toFixed(1) + ' s' : '—'; }
+function esc(s){ return String(s == null ? '' : s).replace(/[&<>"]/g, c => ({'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;'})[c]); }
+function statRow(cells){ return '<tr>' + cells.map(c => '<td>' + c + '</td>').join('') + '</tr>'; }
+
+// Tri des mots : le plus utile en tête, 50 lignes au plus
+const WORD_SORTS = {
+  weak:  (a, b) => (a.ok || 0) / a.n - (b.ok || 0) / b.n || b.n - a.n,
+  slow:  (a, b) => (b.msN ? b.ms / b.msN : 0) - (a.msN ? a.ms / a.msN : 0),
+  often: (a, b) => b.n - a.n,
+};
+let STATS = null;
+
+function renderWords(){
+  const sort = document.getElementById('word-sort').value;
+  const rows = STATS.words.slice().sort(WORD_SORTS[sort]).slice(0, 50)
+    .map(w => statRow([esc(w.pt), esc(w.fr), w.n, pct(w), w.timeouts || 0, meanS(w)]));
+  document.getElementById('word-rows').innerHTML = rows.join('') || statRow(['—', '', '', '', '', '']);
+}
+
+function renderStats(data){
+  const el = document.getElementById('stats-status');
+  if (!data){ el.textContent = 'Statistiques indisponibles : IndexedDB n\\'est pas accessible dans ce navigateur (ou en file://).'; return; }
+  STATS = data;
+  const all = data.rollups.all;
+  el.textContent = all ? '' : 'Aucune partie enregistrée : termine un quiz ou une dictée.';
+  document.getElementById('k-sessions').textContent = all ? all.sessions : 0;
+  document.getElementById('k-answers').textContent = all ? all.n : 0;
+  document.getElementById('k-acc').textContent = pct(all);
+  document.getElementById('k-time').textContent = meanS(all);
+  document.getElementById('kind-rows').innerHTML = [['quiz', '🎧 Quiz (QCM)'], ['dictation', '⌨️ Dictée']]
+    .map(([k, label]) => { const a = data.rollups['kind:' + k]; return statRow([label, a ? a.sessions : 0, a ? a.n : 0, pct(a), meanS(a)]); }).join('');
+  const days = Object.keys(data.rollups).filter(k => k.startsWith('day:')).sort().reverse().slice(0, 14);
+  document.getElementById('day-rows').innerHTML = days
+    .map(k => { const a = data.rollups[k]; return statRow([k.slice(4), a.sessions, a.n, pct(a), meanS(a)]); }).join('') || statRow(['—', '', '', '', '']);
+  renderWords();
+}
+
+function resetStats(){
+  if (!confirm('Effacer toutes les statistiques enregistrées ?')) return;
+  clearResults().then(loadResults).then(renderStats);
+}
+
+loadResults().then(renderStats);
+"""
+
+def build_stats_page(out_dir: Path, assets, cache=None):
+    out_path = out_dir / "stats.html"
+    if cache is not None and not cache.need(out_path, assets.key(*SCRIPTS)):
+        return
+    body = """    <div class="quiz-card">
+      <div class="row kpi">
+        <div class="pill">Parties : <span id="k-sessions">0</span></div>
+        <div class="pill">Réponses : <span id="k-answers">0</span></div>
+        <div class="pill">Réussite : <span id="k-acc">—</span></div>
+        <div class="pill">⏱️ Temps moyen : <span id="k-time">—</span></div>
+      </div>
+      <div id="stats-status" class="small"></div>
+    </div>
+
+    <h2>Par type</h2>
+    <table class="small" style="width:100%;text-align:left">
+      <thead><tr><th>Type</th><th>Parties</th><th>Réponses</th><th>Réussite</th><th>Temps moyen</th></tr></thead>
+      <tbody id="kind-rows"></tbody>
+    </table>
+
+    <h2>Par jour</h2>
+    <table class="small" style="width:100%;text-align:left">
+      <thead><tr><th>Jour</th><th>Parties</th><th>Réponses</th><th>Réussite</th><th>Temps moyen</th></tr></thead>
+      <tbody id="day-rows"></tbody>
+    </table>
+
+    <h2>Par mot</h2>
+    <div class="toolbar">
+      <select id="word-sort" onchange="renderWords()">
+        <option value="weak" selected>À revoir (réussite la plus faible)</option>
+        <option value="slow">Les plus lents</option>
+        <option value="often">Les plus vus</option>
+      </select>
+      <button onclick="resetStats()">🗑️ Effacer les statistiques</button>
+    </div>
+    <table class="small" style="width:100%;text-align:left">
+      <thead><tr><th>Portugais</th><th>Français</th><th>Essais</th><th>Réussite</th><th>Temps écoulé</th><th>Temps moyen</th></tr></thead>
+      <tbody id="word-rows"></tbody>
+    </table>
+    """
+    write_html(out_path, "Statistiques", "Résultats des quiz et dictées terminés sur cet appareil.",
+               body, STATS_JS, assets=assets, scripts=SCRIPTS)
@@ -0,0 +1,96 @@
+# Minification de 25_utils_minify.py : cas délicats (regex, gabarits, insertion automatique de ";"),
+# puis sources réelles du site : mêmes jetons après minification (rien de fusionné ni de coupé), et idempotence.
+# Lancer : python -m unittest discover tests   (ou python -m pytest tests)
+
+import importlib.util
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load(fname, alias=None):
+    """Module numéroté ; `alias` : nom d'import utilisé par les autres modules (comme mod_names dans 01_main.py)."""
+    spec = importlib.util.spec_from_file_location(alias or f"_test_{Path(fname).stem}", ROOT / fname)
+    mod = importlib.util.module_from_spec(spec)
+    if alias:
+        sys.modules[alias] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+minify = load("25_utils_minify.py")
+
+JS_CASES = [
+    ("a = b / c; // division\nd = /x\\/y[/]z/g.test(s)", "a=b/c;d=/x\\/y[/]z/g.test(s)"),
+    ("return /a/ in o", "return/a/ in o"),
+    ("const s = 'a // pas un commentaire';", "const s='a // pas un commentaire';"),
+    ("x = `a  ${ f({ k: '}' }) }  b`;", "x=`a  ${ f({ k: '}' }) }  b`;"),
+    ("a = b + +c; d = e - -f; g = h++\ni++", "a=b+ +c;d=e- -f;g=h++\ni++"),
+    ("function f() {\n  return\n  1;\n}", "function f(){return\n1;}"),
+    ("if (a) {\n  b()\n}\nelse c()", "if(a){b()}\nelse c()"),
+    ("x = 1.5 /* bloc */ * 2", "x=1.5*2"),
+    ("let p = q\n(r)", "let p=q\n(r)"),
+]
+CSS_CASES = [
+    ("a:hover , .b > .c {\n  color : red ;\n}\n/* c */", "a:hover,.b>.c{color:red}"),
+    (".x :hover{margin:0 auto;}", ".x :hover{margin:0 auto}"),
+    ("@media (max-width: 600px){ .a{ width: calc(100% - 2px) } }", "@media (max-width:600px){.a{width:calc(100% - 2px)}}"),
+    (".q::before{content:\"a ;  }\"}", ".q::before{content:\"a ;  }\"}"),
+]
+
+
+def significant(src):
+    return [text for kind, text in minify.js_tokens(src) if kind not in ("ws", "comment")]
+
+
+def real_sources():
+    """Scripts minifiés par le build (MINIFY) : assets et scripts de page."""
+    for fname, alias in (("02_assets_base_css.py", "assets_base_css"),
+                         ("03_assets_base_js_common.py", "assets_base_js_common"),
+                         ("19_assets_word_list_js.py", "assets_word_list_js"),
+                         ("06_utils_write_html.py", "utils_write_html")):   # importés par 26 et 29
+        load(fname, alias)
+    return {
+        "common": load("03_assets_base_js_common.py").get_base_js_common(),
+        "quiz": load("04_assets_quiz_js.py").make_quiz_js(),
+        "dictation": load("13_assets_dictation_js.py").make_dictation_js(),
+        "wordlist": load("19_assets_word_list_js.py").get_word_list_js(),
+        "srs": load("27_assets_srs_js.py").get_srs_js(),
+        "results": load("28_assets_results_js.py").get_results_js(),
+        "stats": load("29_pages_build_stats_page.py").STATS_JS,
+        "sw-reg": load("26_pages_build_service_worker.py").SW_REGISTER_JS,
+    }
+
+
+class MinifyCasesTest(unittest.TestCase):
+    def test_js_cases(self):
+        for src, expected in JS_CASES:
+            with self.subTest(src=src):
+                self.assertEqual(minify.minify_js(src), expected)
+
+    def test_css_cases(self):
+        for src, expected in CSS_CASES:
+            with self.subTest(src=src):
+                self.assertEqual(minify.minify_css(src), expected)
+
+
+class MinifySourcesTest(unittest.TestCase):
+    def test_js_sources(self):
+        for name, src in real_sources().items():
+            with self.subTest(source=name):
+                mini = minify.minify_js(src)
+                self.assertEqual(significant(mini), significant(src))   # aucun jeton fusionné ni coupé
+                self.assertEqual(minify.minify_js(mini), mini)          # idempotence
+                self.assertLess(len(mini), len(src))
+
+    def test_base_css(self):
+        css = load("02_assets_base_css.py").get_base_css()
+        mini = minify.minify_css(css)
+        self.assertEqual(minify.minify_css(mini), mini)
+        self.assertLess(len(mini), len(css))
+
+
+if __name__ == "__main__":
+    unittest.main()
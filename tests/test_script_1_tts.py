@@ -0,0 +1,132 @@
+# Pool de synthèse de 00000_script_1.py avec un moteur local (aucun appel réseau) :
+# sorties identiques en parallèle et en séquentiel, limiteur de débit, nouveaux essais,
+# reprise d'une exécution interrompue.
+# Lancer : python -m unittest discover tests   (ou python -m pytest tests)
+
+import importlib.util
+import json
+import random
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+_spec = importlib.util.spec_from_file_location("script_1", ROOT / "00000_script_1.py")
+script_1 = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(script_1)
+
+
+class FlakyBackend(script_1.StubBackend):
+    """StubBackend texte par texte, qui échoue au premier appel pour les textes de `flaky`."""
+    batch = False
+
+    def __init__(self, flaky=()):
+        self.flaky = set(flaky)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def synthesize(self, texts, slow=False):
+        with self._lock:
+            self.calls.extend(texts)
+            fail = [t for t in texts if t in self.flaky]
+            self.flaky.difference_update(fail)
+        if fail:
+            raise RuntimeError(f"échec simulé : {fail[0]}")
+        return super().synthesize(texts, slow)
+
+
+class ShuffledBackend(FlakyBackend):
+    """Durées de synthèse aléatoires : en parallèle, les audios se terminent dans le désordre."""
+    def synthesize(self, texts, slow=False):
+        time.sleep(random.random() * 0.005)
+        return super().synthesize(texts, slow)
+
+
+def vocab(n):
+    rows = [{"id": f"w{i}", "pt": f"palavra {i}", "fr": f"mot {i}", "phon": ""} for i in range(n)]
+    return script_1.build_vocab_index(rows)[0]
+
+
+class TTSPoolTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.out = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_pool_retry_and_order(self):
+        by_id = vocab(8)
+        backend = FlakyBackend(flaky={"palavra 3"})
+        manifest = script_1.generate_audios(by_id, self.out, jobs=4, retries=2, rate=0, backend=backend)
+        self.assertEqual(list(manifest), list(by_id))                   # ordre du vocabulaire, comme en séquentiel
+        self.assertEqual(backend.calls.count("palavra 3"), 2)           # un échec, puis un nouvel essai réussi
+        self.assertEqual(len(backend.calls), 9)
+        for entry in manifest.values():
+            self.assertTrue((self.out / entry["files"]["normal"]).stat().st_size > 0)
+        self.assertEqual(list(self.out.rglob("*.part")), [])
+
+    def test_parallel_output_matches_serial(self):
+        # Mêmes entrées que le script : vocab.json (avec doublons de prononciation) et lessons.json
+        rows = [{"pt": f"palavra {i % 20}" if i % 7 else f"frase número {i}", "fr": f"mot {i}", "phon": ""}
+                for i in range(40)]
+        (self.out / "vocab.json").write_text(json.dumps(rows, ensure_ascii=False), encoding="utf-8")
+        lessons = [{"id": "L1", "title": "Leçon 1", "words": [r["pt"] for r in rows[:15]]},
+                   {"id": "L2", "title": "Leçon 2", "words": [r["pt"] for r in rows[10:]] + ["absent"]}]
+        trees = {}
+        for jobs in (1, 4):
+            out = self.out / f"jobs{jobs}"
+            by_id, pt_to_id = script_1.build_vocab_index(script_1.load_vocab(self.out / "vocab.json"))
+            manifest = script_1.generate_audios(by_id, out, slow=True, jobs=jobs, rate=0, backend=ShuffledBackend())
+            script_1.write_global_manifest(manifest.values(), out, "json")
+            script_1.build_lesson_manifests(lessons, by_id, out, pt_to_id)
+            trees[jobs] = {p.relative_to(out).as_posix(): p.read_bytes() for p in out.rglob("*") if p.is_file()}
+        self.assertIn("manifest_global.json", trees[1])
+        self.assertIn("lessons/_index.json", trees[1])
+        self.assertEqual(trees[4], trees[1])                            # octet pour octet : manifestes et audios
+
+    def test_failure_after_retries(self):
+        class Broken(FlakyBackend):
+            def synthesize(self, texts, slow=False):
+                raise RuntimeError("moteur indisponible")
+        with self.assertRaises(SystemExit):
+            script_1.generate_audios(vocab(1), self.out, jobs=1, retries=0, rate=0, backend=Broken())
+
+    def test_resume(self):
+        by_id = vocab(5)
+        first = script_1.generate_audios(by_id, self.out, jobs=2, rate=0, backend=FlakyBackend())
+        # Exécution interrompue : un fichier manquant, un .part abandonné à sa place
+        lost = self.out / first["w2"]["files"]["normal"]
+        lost.unlink()
+        lost.with_name(lost.name + ".part").write_bytes(b"tronque")
+        backend = FlakyBackend()
+        second = script_1.generate_audios(by_id, self.out, jobs=2, rate=0, backend=backend)
+        self.assertEqual(backend.calls, ["palavra 2"])                  # seul l'audio manquant est resynthétisé
+        self.assertEqual(second, first)
+        self.assertTrue(lost.stat().st_size > len(b"tronque"))
+
+    def test_backend_requires_synthesize(self):
+        class Incomplete(script_1.TTSBackend):
+            name = "incomplet"
+        with self.assertRaises(TypeError):                              # à la création, pas pendant la synthèse
+            Incomplete()
+
+    def test_rate_limiter(self):
+        limiter = script_1.RateLimiter(rate=20)                         # un appel toutes les 50 ms
+        start = time.monotonic()
+        threads = [threading.Thread(target=limiter.wait) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertGreaterEqual(time.monotonic() - start, 0.24)         # 5 intervalles après le premier appel
+        start = time.monotonic()
+        for _ in range(100):
+            script_1.RateLimiter(rate=0).wait()                         # rate 0 : aucune attente
+        self.assertLess(time.monotonic() - start, 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()